@@ -0,0 +1,2 @@
+# api/ 핸들러들이 함께 쓰는 공용 모듈 모음
+# (파일명이 '_'로 시작하는 폴더라 Vercel이 엔드포인트로 배포하지 않습니다)
@@ -0,0 +1,198 @@
+import asyncio
+import importlib
+import io
+import json
+import os
+import pkgutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import parse_headers
+from urllib.parse import quote
+
+# 한 프로세스에서 api/*.py 전체를 서빙하는 ASGI 앱 (선택적 배포 방식)
+#
+#   pip install uvicorn && uvicorn api._lib.asgi:app --port 8000
+#
+# (Vercel에서 함수 하나로 묶으려면 api/index.py에 `from api._lib.asgi import app` 한 줄을 두고
+#  vercel.json에서 /api/(.*) 를 /api/index 로 rewrite)
+#
+# Vercel 파일별 함수(api/classes.py 등)는 그대로 두고, 같은 handler 클래스를 재사용합니다.
+# - /api/<이름> → api/<이름>.py 의 handler (모듈은 시작 시 한 번만 import)
+# - 모든 엔드포인트가 한 프로세스의 Supabase 클라이언트(httpx 커넥션 풀)와
+#   커리큘럼/학부모 스냅샷 캐시를 공유 → 요청마다 import·클라이언트 생성 비용이 없음
+# - handler는 동기 코드라 이벤트 루프를 막지 않도록 공용 스레드 풀에서 실행
+#   (supabase-py 호출은 I/O 대기 중 GIL을 놓으므로 스레드로 충분히 겹칩니다)
+# - lifespan startup에서 클라이언트 생성 + 커리큘럼 캐시를 미리 채움
+# 외부 프레임워크 의존성은 없습니다. (ASGI 서버만 필요)
+
+# 동시에 실행할 handler 수 (ASGI_WORKERS 환경변수로 조정)
+MAX_WORKERS = int(os.environ.get('ASGI_WORKERS', '32'))
+
+# 요청 본문 최대 크기 (일괄 평가 저장 500건도 충분히 들어감)
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+_executor = None
+_lock = threading.Lock()
+_routes = {}
+
+
+def discover_handlers():
+    """{이름: handler 클래스} - api/ 아래 handler가 있는 모듈 (_lib 같은 비공개 패키지 제외)"""
+    import api
+
+    handlers = {}
+    for info in pkgutil.iter_modules(api.__path__):
+        if info.name.startswith('_') or info.ispkg:
+            continue
+        module = importlib.import_module(f'api.{info.name}')
+        if hasattr(module, 'handler'):
+            handlers[info.name] = module.handler
+    return handlers
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='asgi')
+    return _executor
+
+
+def _get_routes():
+    if not _routes:
+        with _lock:
+            if not _routes:
+                for name, handler_cls in discover_handlers().items():
+                    # 요청마다 stderr에 접근 로그를 쓰지 않도록
+                    _routes[name] = type('handler', (handler_cls,), {'log_message': lambda *args: None})
+    return _routes
+
+
+def _run_handler(handler_cls, method, raw_path, headers, body, client):
+    """
+    소켓 없이 BaseHTTPRequestHandler를 실행하고 (status, headers, body)를 돌려줍니다.
+    handler가 wfile에 쓴 HTTP 응답(상태줄 + 헤더 + 본문)을 그대로 파싱합니다.
+    """
+    handler = handler_cls.__new__(handler_cls)
+    handler.rfile = io.BytesIO(body)
+    handler.wfile = io.BytesIO()
+    handler.client_address = client
+    handler.server = None
+    handler.command = method
+    handler.path = raw_path
+    handler.request_version = 'HTTP/1.1'
+    handler.requestline = f"{method} {raw_path} HTTP/1.1"
+    handler.close_connection = True
+    handler.headers = headers
+
+    do_method = getattr(handler, f'do_{method}', None)
+    if do_method is None:
+        return 405, [(b'content-type', b'application/json; charset=utf-8')], \
+            json.dumps({"error": f"{method} 메서드는 지원하지 않습니다."}).encode('utf-8')
+
+    try:
+        do_method()
+    except Exception as e:
+        print(f"ASGI Handler Error ({raw_path}): {str(e)}")
+        if not handler.wfile.getvalue():
+            return 500, [(b'content-type', b'application/json; charset=utf-8')], \
+                json.dumps({"error": str(e)}).encode('utf-8')
+
+    raw = handler.wfile.getvalue()
+    head, _, response_body = raw.partition(b'\r\n\r\n')
+    lines = head.split(b'\r\n')
+    status = int(lines[0].split(b' ', 2)[1])
+    response_headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        # Server/Date는 ASGI 서버가 붙임
+        if name.lower() in (b'server', b'date'):
+            continue
+        response_headers.append((name.strip().lower(), value.strip()))
+    return status, response_headers, response_body
+
+
+def _warm_up():
+    # 첫 요청 전에 클라이언트와 공용 캐시를 준비 (환경변수가 없으면 건너뜀)
+    from api._lib.db import get_client
+    from api._lib.curriculum import get_curriculum
+
+    _get_routes()
+    try:
+        get_curriculum(get_client())
+    except Exception as e:
+        print(f"ASGI Warm-up Error: {str(e)}")
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return False
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _send_simple(send, status, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status, 'headers': [
+        (b'content-type', b'application/json; charset=utf-8'),
+        (b'content-length', str(len(body)).encode()),
+    ]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await asyncio.get_running_loop().run_in_executor(_get_executor(), _warm_up)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    # /api/evaluate, /api/evaluate/ → 'evaluate'
+    parts = scope['path'].strip('/').split('/')
+    handler_cls = _get_routes().get(parts[1]) if len(parts) == 2 and parts[0] == 'api' else None
+    if handler_cls is None:
+        await _send_simple(send, 404, {"error": "없는 API 경로입니다."})
+        return
+
+    body = await _read_body(receive)
+    if body is None:
+        return
+    if body is False:
+        await _send_simple(send, 413, {"error": "요청 본문이 너무 큽니다."})
+        return
+
+    # handler는 (퍼센트 인코딩된) 원래 경로 + 쿼리스트링을 self.path로 받음
+    raw_path = (scope.get('raw_path') or quote(scope['path']).encode()).decode('latin-1')
+    if scope.get('query_string'):
+        raw_path += '?' + scope['query_string'].decode('latin-1')
+    header_block = b''.join(name + b': ' + value + b'\r\n' for name, value in scope['headers'])
+    headers = parse_headers(io.BytesIO(header_block + b'\r\n'))
+    if body and 'content-length' not in headers:
+        headers['Content-Length'] = str(len(body))
+
+    status, response_headers, response_body = await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), _run_handler, handler_cls, scope['method'], raw_path, headers, body,
+        tuple(scope.get('client') or ('', 0)),
+    )
+    await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': response_body})
@@ -0,0 +1,13 @@
+import hmac
+import os
+
+# 운영용 호출(Vercel Cron, 일괄 작업) 인증
+# Vercel은 CRON_SECRET 환경변수가 있으면 "Authorization: Bearer <CRON_SECRET>" 헤더를 붙여 호출합니다.
+# 관리 스크립트에서 직접 호출할 때도 같은 헤더를 씁니다.
+
+
+def has_cron_secret(header):
+    secret = os.environ.get('CRON_SECRET')
+    if not secret or not header:
+        return False
+    return hmac.compare_digest(header.encode('utf-8'), f"Bearer {secret}".encode('utf-8'))
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class TTLCache:
+    """
+    프로세스 내 짧은 수명 캐시 (스레드 안전)
+    - ttl: 항목 유효 시간(초)
+    - maxsize: 최대 항목 수, 넘치면 가장 오래 안 쓴 것부터 제거(LRU)
+    """
+
+    def __init__(self, ttl, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Call:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출을 하나로 합침 (스레드 안전)
+    먼저 온 호출만 fn()을 실행하고, 그동안 들어온 호출은 기다렸다가 같은 결과(또는 같은 예외)를 받습니다.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> 진행 중인 _Call
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+# --- 조회 API 응답 캐시 ---
+# 수업 시작 시각에 선생님 탭 여러 개가 대시보드/수업 목록을 동시에 새로고침해도
+# 한 프로세스에서는 DB 조회가 한 번만 나가도록:
+#   1) RESPONSE_TTL초 동안은 캐시된 결과를 그대로 사용
+#   2) 캐시가 비어 있을 때 동시에 온 요청은 SingleFlight로 조회 하나를 같이 기다림
+# 키의 첫 요소가 태그('dashboard', 'classes')이고, 쓰기 API(classes/evaluate/students/master_students POST)가
+# invalidate(태그)로 지웁니다.
+#   - ASGI 단일 앱(api/_lib/asgi.py): 모든 핸들러가 한 프로세스라 다른 API의 쓰기도 바로 반영
+#   - Vercel 파일별 함수: 같은 파일의 쓰기만 반영되고, 다른 함수의 쓰기는 RESPONSE_TTL초가
+#     신선도의 상한 (invalidate는 자기 프로세스의 빈 캐시를 지울 뿐이라 비용 없음)
+
+RESPONSE_TTL = 3
+
+_responses = TTLCache(ttl=RESPONSE_TTL, maxsize=64)
+_flight = SingleFlight()
+_generations = {}  # 태그 -> invalidate 횟수
+_generations_lock = threading.Lock()
+
+
+def cached(key, loader):
+    """key=(태그, ...) 의 캐시된 값 또는 loader() 결과 (동시 호출은 loader 한 번)"""
+    value = _responses.get(key)
+    if value is not None:
+        return value
+
+    # invalidate 이후에 온 요청은 그 전에 시작된 조회에 합류하지 않도록 세대 번호를 키에 포함
+    generation = _generations.get(key[0], 0)
+
+    def load():
+        value = loader()
+        with _generations_lock:
+            # 조회 도중 invalidate 되었으면 (쓰기 전 데이터일 수 있으므로) 캐시에 넣지 않음
+            if _generations.get(key[0], 0) == generation:
+                _responses.set(key, value)
+        return value
+
+    return _flight.do((key, generation), load)
+
+
+def invalidate(*tags):
+    with _generations_lock:
+        for tag in tags:
+            _generations[tag] = _generations.get(tag, 0) + 1
+        _responses.delete_where(lambda key: key[0] in tags)
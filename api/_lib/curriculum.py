@@ -0,0 +1,64 @@
+import threading
+import time
+
+# 커리큘럼은 거의 바뀌지 않으므로 프로세스 단위로 캐시합니다.
+# (Vercel warm 인스턴스에서는 모듈 전역 변수가 요청 사이에 유지됨)
+# TTL이 지나면 cache_versions의 버전 번호만 확인하고, 바뀐 경우에만 전체를 다시 가져옵니다.
+TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_cache = {
+    'rows': None,       # curriculum 행 목록 (id 순)
+    'index': {},        # id -> 목록 내 위치
+    'version': None,    # 마지막으로 확인한 DB 버전
+    'checked_at': 0.0,  # 마지막 확인 시각 (monotonic)
+}
+
+
+def _fetch_version(supabase):
+    # 버전 테이블이 아직 없는 환경에서는 None (→ TTL마다 전체 재조회)
+    try:
+        res = supabase.table('cache_versions').select('version').eq('name', 'curriculum').execute()
+    except Exception:
+        return None
+    return res.data[0]['version'] if res.data else None
+
+
+def get_curriculum(supabase):
+    """
+    (curriculum 목록, {id: 위치}) 튜플을 반환합니다.
+    반환된 목록은 여러 요청이 공유하므로 수정하지 마세요.
+    """
+    if _cache['rows'] is not None and time.monotonic() - _cache['checked_at'] < TTL_SECONDS:
+        return _cache['rows'], _cache['index']
+
+    with _lock:
+        # 기다리는 동안 다른 스레드가 이미 갱신했을 수 있음
+        if _cache['rows'] is not None and time.monotonic() - _cache['checked_at'] < TTL_SECONDS:
+            return _cache['rows'], _cache['index']
+
+        # 버전을 먼저 읽어야, 조회 도중 수정이 생겨도 다음 확인 때 다시 가져옵니다.
+        version = _fetch_version(supabase)
+        if _cache['rows'] is None or version is None or version != _cache['version']:
+            rows = supabase.table('curriculum').select('*').order('id').execute().data or []
+            _cache['rows'] = rows
+            _cache['index'] = {item['id']: i for i, item in enumerate(rows)}
+        _cache['version'] = version
+        _cache['checked_at'] = time.monotonic()
+
+        return _cache['rows'], _cache['index']
+
+
+def cached_version():
+    # 캐시된 커리큘럼을 읽을 때 확인한 DB 버전 (cache_versions가 없는 환경이면 None)
+    return _cache['version']
+
+
+def invalidate_curriculum():
+    # 커리큘럼을 수정하는 코드에서 호출 (다음 요청 때 즉시 재조회)
+    # 다른 인스턴스는 DB 트리거가 올린 버전 번호로 TTL 이후 갱신됩니다.
+    with _lock:
+        _cache['rows'] = None
+        _cache['index'] = {}
+        _cache['version'] = None
+        _cache['checked_at'] = 0.0
@@ -0,0 +1,33 @@
+import os
+import threading
+
+from api._lib.timing import TimedClient
+
+# 프로세스당 Supabase 클라이언트 하나만 만들어 모든 핸들러가 공유합니다.
+# - import 시점이 아니라 첫 요청에서 생성 (supabase 패키지 로딩도 그때까지 미룸 → 콜드 스타트 단축)
+# - 같은 클라이언트를 재사용하므로 내부 httpx 세션의 keep-alive 커넥션 풀이 요청 사이에 유지됩니다.
+# - TimedClient로 감싸서 돌려줌 (샘플링된 요청에서만 .execute() 시간을 기록, api/_lib/timing.py)
+_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                url = os.environ.get("VITE_SUPABASE_URL")
+                key = os.environ.get("VITE_SUPABASE_ANON_KEY")
+                if not url or not key:
+                    raise ValueError("환경변수 누락")
+
+                from supabase import create_client
+                _client = TimedClient(create_client(url, key))
+    return _client
+
+
+def set_client(client):
+    """로컬 하네스/벤치마크에서 가짜 클라이언트를 주입할 때 사용 (None이면 다시 환경변수로 생성)"""
+    global _client
+    with _lock:
+        _client = TimedClient(client) if client is not None else None
@@ -0,0 +1,161 @@
+import time
+from datetime import date, datetime
+
+from api._lib.curriculum import cached_version, get_curriculum, invalidate_curriculum
+from api._lib.recommend_engine import ACTIONS, decide_batch
+from api._lib.risk import assess
+
+# 정기 일괄 작업 (api/cron.py가 Vercel Cron으로 호출, 로컬에서는 CLI로 실행)
+#   python -m api._lib.jobs recommendations
+#   python -m api._lib.jobs parents   (명단 일괄 등록 후 학부모 재매칭)
+#   python -m api._lib.jobs risk
+
+# 한 번에 계산/저장하는 학생 수
+RECOMMEND_BATCH = 1000
+RISK_BATCH = 1000
+
+# Vercel 함수 최대 실행 시간보다 짧게 끊고, 남은 학생은 다음 실행에서 이어서 처리
+TIME_BUDGET_SECONDS = 45
+
+
+def run_recommendations(supabase, time_budget=TIME_BUDGET_SECONDS):
+    """
+    추천 행이 없는(새 기록이 생겨 지워진) 학생들의 다음 수업 추천을 계산해 recommendations에 저장합니다.
+    (정의: supabase/migrations/20261018001200_recommendations.sql)
+    """
+    started = time.monotonic()
+
+    # 배치는 항상 최신 커리큘럼으로 계산하고, 그 버전을 같이 넘겨 저장 시점에 확인
+    invalidate_curriculum()
+    curriculum, _ = get_curriculum(supabase)
+    version = cached_version()
+    curriculum_ids = [unit['id'] for unit in curriculum]
+    titles = {unit['id']: unit['title'] for unit in curriculum}
+
+    computed = stored = batches = 0
+    while time.monotonic() - started < time_budget:
+        inputs = supabase.rpc('recommendation_inputs', {'p_limit': RECOMMEND_BATCH}).execute().data or []
+        if not inputs:
+            break
+
+        has_log = [row['last_log_at'] is not None for row in inputs]
+        actions, unit_ids = decide_batch(
+            has_log,
+            [row['last_score'] for row in inputs],
+            [row['last_max_unit'] or 0 for row in inputs],
+            curriculum_ids,
+        )
+
+        rows = []
+        for row, logged, action, unit_id in zip(inputs, has_log, actions, unit_ids):
+            action = ACTIONS[action]
+            # decide()와 같은 모양 (기록이 있으면 점수 없음 → 0)
+            rows.append({
+                'student_id': row['student_id'],
+                'action': action,
+                'unit_ids': [unit_id] if unit_id != -1 else [],
+                'last_score': (row['last_score'] or 0) if logged else None,
+                'next_title': titles.get(unit_id) if action == 'next' else None,
+                'based_on_log_at': row['last_log_at'],
+            })
+
+        saved = supabase.rpc('store_recommendations', {
+            'p_rows': rows,
+            'p_curriculum_version': version
+        }).execute().data or 0
+
+        computed += len(rows)
+        stored += saved
+        batches += 1
+        # 전부 거절됨(계산 도중 커리큘럼 변경) 또는 마지막 배치
+        if saved == 0 or len(inputs) < RECOMMEND_BATCH:
+            break
+
+    return {
+        "computed": computed,
+        "stored": stored,
+        "batches": batches,
+        "elapsed_ms": round((time.monotonic() - started) * 1000)
+    }
+
+
+def _local_date(timestamp):
+    # timestamptz 문자열 → 서버 기준 날짜 (대시보드의 '오늘'과 같은 기준)
+    if not timestamp:
+        return None
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).astimezone().date()
+
+
+def run_risk(supabase, time_budget=TIME_BUDGET_SECONDS):
+    """
+    기록/반/반 시간표가 바뀌었거나 결석 판정일이 된 학생만 다시 판정해 student_risk에 저장합니다.
+    대시보드는 저장된 결과만 읽습니다. (정의: supabase/migrations/20261018001600_student_risk.sql)
+    """
+    started = time.monotonic()
+    today = date.today()
+
+    evaluated = stored = flagged = batches = 0
+    while time.monotonic() - started < time_budget:
+        inputs = supabase.rpc('risk_inputs', {
+            'p_today': today.isoformat(),
+            'p_limit': RISK_BATCH
+        }).execute().data or []
+        if not inputs:
+            break
+
+        rows = []
+        for row in inputs:
+            result = assess(row['recent_scores'], _local_date(row['last_log_at']), row['schedule_days'], today)
+            flagged += result['flagged']
+            rows.append({
+                'student_id': row['student_id'],
+                'class_id': row['class_id'],
+                'stats_updated_at': row['stats_updated_at'],
+                # 판정에 쓴 시간표 (저장 시 현재 시간표와 다르면 건너뛰고, 나중에 바뀌면 다시 판정)
+                'schedule_days': row['schedule_days'],
+                **result,
+            })
+
+        saved = supabase.rpc('store_student_risk', {'p_rows': rows}).execute().data or 0
+
+        evaluated += len(rows)
+        stored += saved
+        batches += 1
+        # 전부 건너뜀(판정 도중 기록 변경) 또는 마지막 배치
+        if saved == 0 or len(inputs) < RISK_BATCH:
+            break
+
+    return {
+        "evaluated": evaluated,
+        "stored": stored,
+        "flagged": flagged,
+        "batches": batches,
+        "elapsed_ms": round((time.monotonic() - started) * 1000)
+    }
+
+
+def run_parent_rematch(supabase):
+    """
+    학부모가 연결되지 않은 학생을 가입한 학부모 번호(user_roles.phone_digits)와 한 번에 매칭합니다.
+    (정의: supabase/migrations/20261018001300_parent_phone_match.sql)
+    """
+    started = time.monotonic()
+    matched = supabase.rpc('rematch_parents', {}).execute().data or 0
+    return {"matched": matched, "elapsed_ms": round((time.monotonic() - started) * 1000)}
+
+
+JOBS = {
+    'recommendations': run_recommendations,
+    'parents': run_parent_rematch,
+    'risk': run_risk,
+}
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    from api._lib.db import get_client
+
+    for name in sys.argv[1:] or list(JOBS):
+        print(json.dumps({"job": name, **JOBS[name](get_client())}, ensure_ascii=False))
@@ -0,0 +1,14 @@
+import re
+
+# 전화번호 정규화: 숫자만 남기고, 국가번호(+82 10...)는 국내 형식(010...)으로
+# DB의 normalize_phone() 함수(supabase/migrations/20261018000700_student_search.sql)와 같은 규칙이어야
+# *_digits 컬럼과 비교할 수 있습니다.
+_NON_DIGIT = re.compile(r'\D')
+_COUNTRY_CODE = re.compile(r'^82(1\d{8,9})$')
+
+
+def normalize_phone(phone):
+    if not phone:
+        return ''
+    digits = _NON_DIGIT.sub('', str(phone))
+    return _COUNTRY_CODE.sub(r'0\1', digits)
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
+
+# 서로 독립적인 Supabase 조회를 동시에 실행하기 위한 공용 스레드 풀
+# supabase-py는 동기(httpx) 클라이언트라, I/O 대기 중에는 GIL이 풀려 스레드만으로도 충분히 겹칩니다.
+MAX_WORKERS = 8
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    # 콜드 스타트 비용을 줄이기 위해 첫 사용 시점에 생성 (warm 인스턴스에서는 재사용)
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='query')
+    return _executor
+
+
+def _run(task):
+    # 쿼리 빌더면 .execute(), 그 외에는 일반 함수로 호출
+    if hasattr(task, 'execute'):
+        return task.execute()
+    return task()
+
+
+def gather(*tasks):
+    """
+    독립적인 조회들을 동시에 실행하고, 넘긴 순서대로 결과를 돌려줍니다.
+    tasks: 아직 .execute() 하지 않은 쿼리 빌더, 또는 인자 없는 함수
+    (하나라도 실패하면 해당 예외를 그대로 다시 발생시킵니다)
+    """
+    if len(tasks) <= 1:
+        return [_run(t) for t in tasks]
+
+    executor = _get_executor()
+    # 첫 번째 작업은 현재 스레드에서 직접 실행 (스레드 하나를 아끼고 대기 시간도 줄임)
+    # 나머지는 현재 컨텍스트를 복사해서 실행 → 요청 타이머(api/_lib/timing.py)가 작업 스레드에서도 보임
+    futures = [executor.submit(contextvars.copy_context().run, _run, t) for t in tasks[1:]]
+    first = _run(tasks[0])
+    return [first] + [f.result() for f in futures]
@@ -0,0 +1,93 @@
+# 진도 추천 엔진 (순수 함수, I/O 없음)
+# "지난 점수 < 70 → 복습, 아니면 커리큘럼의 다음 단원" 규칙을 한곳에 모았습니다.
+# api/recommend.py, api/evaluate.py가 같은 규칙을 쓰고, 문구(reason)만 각자 다르게 씁니다.
+
+REVIEW_THRESHOLD = 70
+
+# 추천 종류 (배치 계산에서는 이 튜플의 위치를 정수 코드로 사용)
+ACTIONS = ('none', 'first', 'review', 'next', 'complete')
+NONE, FIRST, REVIEW, NEXT, COMPLETE = range(len(ACTIONS))
+
+# recommendations 테이블(야간 일괄 계산 결과)에서 읽는 컬럼 - decide() 반환값과 같은 모양이라 그대로 사용
+STORED_COLUMNS = 'action, unit_ids, last_score, next_title'
+
+
+def decide(last_log, curriculum, curriculum_index, threshold=REVIEW_THRESHOLD):
+    """
+    마지막 기록 1건으로 다음 추천을 결정합니다.
+    curriculum_index: {단원 id: curriculum 내 위치} (api/_lib/curriculum.py가 만들어 둔 것)
+    반환: {'action', 'unit_ids', 'last_score', 'next_title'}
+    """
+    decision = {'action': 'none', 'unit_ids': [], 'last_score': None, 'next_title': None}
+
+    if not last_log:
+        # 기록 없으면 1단원
+        if curriculum:
+            decision['action'] = 'first'
+            decision['unit_ids'] = [curriculum[0]['id']]
+        return decision
+
+    last_units = last_log.get('selected_units') or []
+    last_score = last_log.get('score') or 0
+    # 마지막으로 배운 단원의 ID (여러 개면 가장 큰 숫자 기준)
+    last_max_id = max(last_units) if last_units else 0
+    decision['last_score'] = last_score
+
+    if last_score < threshold:
+        # 점수가 낮으면 → 복습
+        decision['action'] = 'review'
+        decision['unit_ids'] = [last_max_id]
+        return decision
+
+    # 점수가 높으면 → 다음 단원 (없으면 커리큘럼 완주)
+    current_idx = curriculum_index.get(last_max_id, -1)
+    if current_idx != -1 and current_idx < len(curriculum) - 1:
+        next_unit = curriculum[current_idx + 1]
+        decision['action'] = 'next'
+        decision['unit_ids'] = [next_unit['id']]
+        decision['next_title'] = next_unit['title']
+    else:
+        decision['action'] = 'complete'
+        decision['unit_ids'] = [last_max_id]
+    return decision
+
+
+def format_reason(decision, reasons):
+    """
+    reasons: {'first': ..., 'review': ..., 'next': ..., 'complete': ...} 문구 템플릿
+    ({score}, {title} 자리표시자 사용 가능)
+    """
+    template = reasons.get(decision['action'], '')
+    return template.format(score=decision['last_score'], title=decision['next_title'])
+
+
+def decide_batch(has_log, last_scores, last_max_ids, curriculum_ids, threshold=REVIEW_THRESHOLD):
+    """
+    N명의 추천을 한 번에 계산합니다. (야간 일괄 계산용, 외부 라이브러리 없음)
+    has_log:        N개 bool  - 기록 존재 여부
+    last_scores:    N개 숫자  - 마지막 점수 (기록 없으면 무시됨, None은 0점)
+    last_max_ids:   N개 정수  - 마지막 기록의 최대 단원 id (단원 없으면 0)
+    curriculum_ids: M개 정수  - id 오름차순 커리큘럼 단원 id
+    반환: (actions, unit_ids) 리스트 - actions는 ACTIONS 위치 코드, unit_ids는 추천 단원 id (none이면 -1)
+    decide()와 학생별 결과가 동일합니다.
+    """
+    # 단원 id → 다음 단원 id (마지막 단원은 None) - 학생마다 커리큘럼을 다시 찾지 않도록 한 번만 만듦
+    next_of = {unit_id: (curriculum_ids[i + 1] if i + 1 < len(curriculum_ids) else None)
+               for i, unit_id in enumerate(curriculum_ids)}
+    first_action, first_id = (FIRST, curriculum_ids[0]) if curriculum_ids else (NONE, -1)
+
+    actions, unit_ids = [], []
+    for logged, score, last_max_id in zip(has_log, last_scores, last_max_ids):
+        if not logged:
+            actions.append(first_action)
+            unit_ids.append(first_id)
+        elif (score or 0) < threshold:
+            actions.append(REVIEW)
+            unit_ids.append(last_max_id)
+        elif next_of.get(last_max_id) is not None:
+            actions.append(NEXT)
+            unit_ids.append(next_of[last_max_id])
+        else:
+            actions.append(COMPLETE)
+            unit_ids.append(last_max_id)
+    return actions, unit_ids
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import json
+
+from api._lib import timing
+
+# 공용 JSON 응답 헬퍼
+# - orjson이 있으면 사용 (표준 json보다 수 배 빠름), 없으면 json으로 대체
+# - Accept-Encoding에 따라 br(brotli 설치 시) / gzip 압축
+# - Content-Length 설정, GET/HEAD 200 응답에는 ETag → 폴링 요청이 If-None-Match로 오면 본문 없이 304
+# - 본문은 먼저 전부 직렬화(+압축)한 뒤 CHUNK_SIZE 단위로 나눠 소켓에 기록
+#   (스트리밍이 아니므로 메모리에는 전체 본문이 한 번에 올라감)
+# - 시간 측정 중인 요청이면 직렬화/압축 시간을 기록하고 Server-Timing 헤더를 붙임
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CHUNK_SIZE = 64 * 1024
+# 이보다 작은 응답은 압축 이득보다 CPU 비용이 커서 그대로 전송
+MIN_COMPRESS_BYTES = 1024
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    # 약한 비교: W/ 접두어는 무시
+    bare = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def _negotiate_encoding(accept_encoding):
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def send_json(handler, data, status=200, headers=None):
+    """
+    handler: BaseHTTPRequestHandler 인스턴스
+    data: JSON으로 보낼 값 / headers: 추가 응답 헤더 dict
+    """
+    with timing.span('json'):
+        body = dumps(data)
+    extra_headers = dict(headers or {})
+
+    timer = timing.current()
+    if timer is not None:
+        timer.status = status
+
+    # 조건부 요청(If-None-Match)은 조회에만 의미가 있음 - POST 결과를 304로 삼키지 않도록
+    if status == 200 and handler.command in ('GET', 'HEAD'):
+        etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        extra_headers['ETag'] = etag
+        if _etag_matches(handler.headers.get('If-None-Match'), etag):
+            # 클라이언트가 가진 것과 같으면 본문 없이 304
+            if timer is not None:
+                timer.status = 304
+                extra_headers['Server-Timing'] = timer.server_timing()
+            handler.send_response(304)
+            for name, value in extra_headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            return
+
+    encoding = None
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = _negotiate_encoding(handler.headers.get('Accept-Encoding'))
+        if encoding:
+            with timing.span(encoding):
+                if encoding == 'br':
+                    body = brotli.compress(body, quality=5)
+                else:
+                    body = gzip.compress(body, compresslevel=5)
+
+    if timer is not None:
+        extra_headers['Server-Timing'] = timer.server_timing()
+
+    handler.send_response(status)
+    handler.send_header('Content-type', 'application/json; charset=utf-8')
+    handler.send_header('Content-Length', str(len(body)))
+    handler.send_header('Vary', 'Accept-Encoding')
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    for name, value in extra_headers.items():
+        handler.send_header(name, value)
+    handler.end_headers()
+
+    if handler.command == 'HEAD':
+        return
+    for start in range(0, len(body), CHUNK_SIZE):
+        handler.wfile.write(body[start:start + CHUNK_SIZE])
@@ -0,0 +1,90 @@
+import os
+from datetime import date, timedelta
+
+# 집중 케어 학생 판정 규칙 (DB/HTTP 없음 - api/_lib/jobs.py의 risk 작업이 호출)
+# 학생마다 student_stats.recent_scores(최근 30건, 최신이 앞)와 반 시간표만 보고 판정합니다.
+#   low_avg   : 최근 RISK_WINDOW회 평균이 RISK_LOW_AVG점 미만
+#   declining : 최근 RISK_WINDOW회 평균이 그 전 RISK_WINDOW회 평균보다 RISK_DECLINE_POINTS점 이상 낮음
+#   missed    : 마지막 기록 이후 반 시간표상 수업이 RISK_MISSED_SESSIONS회 이상 지났는데 기록 없음
+# 기준값은 환경변수로 조정합니다.
+
+
+def _env_number(name, default, cast=float):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return cast(default)
+
+
+# recent_scores가 30건까지라 두 구간(최근 + 이전)이 들어가도록 15 이하
+RISK_WINDOW = min(max(_env_number('RISK_WINDOW', 5, int), 1), 15)
+RISK_LOW_AVG = _env_number('RISK_LOW_AVG', 70)
+RISK_DECLINE_POINTS = _env_number('RISK_DECLINE_POINTS', 10)
+RISK_MISSED_SESSIONS = max(_env_number('RISK_MISSED_SESSIONS', 2, int), 1)
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def _sessions_after(last_day, schedule_days):
+    # last_day 다음 날부터 수업 요일(월=0 ... 일=6)에 해당하는 날짜를 차례로
+    day = last_day
+    while True:
+        day += timedelta(days=1)
+        if day.weekday() in schedule_days:
+            yield day
+
+
+def missed_sessions(last_day, schedule_days, today):
+    """
+    (마지막 기록 이후 지나간 수업 수 - 최대 RISK_MISSED_SESSIONS, 판정이 바뀔 수 있는 다음 날짜)
+    오늘 수업은 아직 끝나지 않았을 수 있으므로 어제까지만 셉니다.
+    이미 기준에 닿았으면 다음 날짜는 None (새 기록이 생길 때까지 그대로)
+    """
+    days = {d for d in schedule_days or () if 0 <= d <= 6}
+    if last_day is None or not days:
+        return 0, None
+
+    sessions = _sessions_after(last_day, days)
+    for missed in range(RISK_MISSED_SESSIONS):
+        day = next(sessions)
+        if day >= today:
+            # 기준 번째 수업 다음 날부터 판정이 바뀜
+            for _ in range(missed + 1, RISK_MISSED_SESSIONS):
+                day = next(sessions)
+            return missed, day + timedelta(days=1)
+    return RISK_MISSED_SESSIONS, None
+
+
+def assess(recent_scores, last_log_day, schedule_days, today=None):
+    """
+    학생 한 명 판정 → student_risk 행에 들어갈 값
+    recent_scores: 최신이 앞인 점수 목록 (점수 없는 기록은 None)
+    last_log_day : 마지막 기록 날짜 (date 또는 None)
+    """
+    today = today or date.today()
+    scores = [s for s in (recent_scores or []) if s is not None]
+    recent = scores[:RISK_WINDOW]
+    previous = scores[RISK_WINDOW:RISK_WINDOW * 2]
+    recent_avg = _mean(recent)
+    previous_avg = _mean(previous) if len(previous) == RISK_WINDOW else None
+    trend = recent_avg - previous_avg if recent_avg is not None and previous_avg is not None else None
+    missed, next_check = missed_sessions(last_log_day, schedule_days, today)
+
+    reasons = []
+    if recent_avg is not None and recent_avg < RISK_LOW_AVG:
+        reasons.append({"code": "low_avg", "message": f"최근 {len(recent)}회 평균 {recent_avg:.1f}점"})
+    if trend is not None and -trend >= RISK_DECLINE_POINTS:
+        reasons.append({"code": "declining", "message": f"최근 {RISK_WINDOW}회 평균이 이전보다 {-trend:.1f}점 하락"})
+    if missed >= RISK_MISSED_SESSIONS:
+        reasons.append({"code": "missed", "message": f"마지막 기록({last_log_day.isoformat()}) 이후 수업 {missed}회 이상 기록 없음"})
+
+    return {
+        "flagged": bool(reasons),
+        "reasons": reasons,
+        "recent_avg": round(recent_avg, 1) if recent_avg is not None else None,
+        "trend": round(trend, 1) if trend is not None else None,
+        "missed": missed,
+        "next_check_date": next_check.isoformat() if next_check else None,
+    }
@@ -0,0 +1,81 @@
+from api._lib.phone import normalize_phone
+from api._lib.schedule import SLOT_PATTERN, parse_schedule, schedule_fields
+
+# 학생/수업 행 정규화 - 화면에서 한 건씩 만드는 API(master_students.py, classes.py POST)와
+# 명단 일괄 등록 스크립트(scripts/roster.py)가 같은 규칙으로 저장하도록 한 곳에 둡니다.
+
+# students 테이블에 저장하는 입력 컬럼 (생성 컬럼 *_digits 제외)
+STUDENT_COLUMNS = (
+    'name', 'school_name', 'phone_number', 'parent_phone_1', 'parent_phone_2',
+    'grade', 'avatar_color', 'class_id'
+)
+
+CLASS_COLUMNS = ('name', 'schedule', 'target_grade')
+
+# 일괄 등록 시 색을 지정하지 않은 학생 (StudentMaster.tsx의 색 목록과 같음)
+AVATAR_COLORS = (
+    'bg-blue-100 text-blue-600', 'bg-green-100 text-green-600',
+    'bg-purple-100 text-purple-600', 'bg-yellow-100 text-yellow-600'
+)
+
+
+def _clean(value):
+    # 엑셀/CSV 빈 칸('', 공백, None) → None, 숫자로 읽힌 값은 문자열로
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def clean_row(row):
+    # CSV/XLSX 한 줄 → 앞뒤 공백을 지우고 빈 칸은 None (머리글이 없는 열은 버림)
+    return {key.strip(): _clean(value) for key, value in row.items() if key}
+
+
+def normalize_grade(row):
+    # 화면은 school_type('중') + grade_num('2')을 따로 보내고, 없으면 grade('중2')를 그대로 사용
+    school_type = _clean(row.get('school_type')) or ''
+    grade_num = _clean(row.get('grade_num')) or ''
+    if grade_num.endswith('.0'):
+        grade_num = grade_num[:-2]  # 엑셀 숫자 칸 (2.0)
+    return f"{school_type}{grade_num}" if school_type and grade_num else (row.get('grade') or '')
+
+
+def student_row(row):
+    # master_students.py POST 본문 / CSV 한 줄 → students 행
+    return {
+        "name": row.get('name'),
+        "school_name": row.get('school_name'),
+        "phone_number": row.get('phone_number'),
+        "parent_phone_1": row.get('parent_phone_1'),
+        "parent_phone_2": row.get('parent_phone_2'),
+        "grade": normalize_grade(row),
+        "avatar_color": row.get('avatar_color')
+    }
+
+
+def class_row(row):
+    # classes.py POST 본문 / CSV 한 줄 → classes 행 (시간표 인덱스 컬럼 포함)
+    return {**row, **schedule_fields(row.get('schedule', ''))}
+
+
+def validate_student(row):
+    """일괄 등록용 검사. 문제가 있으면 오류 메시지, 없으면 None"""
+    if not _clean(row.get('name')):
+        return "이름이 비어 있습니다."
+    for column in ('phone_number', 'parent_phone_1', 'parent_phone_2'):
+        digits = normalize_phone(_clean(row.get(column)))
+        if digits and not 9 <= len(digits) <= 11:
+            return f"{column} 전화번호 형식 오류: {row.get(column)}"
+    return None
+
+
+def validate_class(row):
+    if not _clean(row.get('name')):
+        return "수업 이름이 비어 있습니다."
+    schedule = _clean(row.get('schedule'))
+    # 형식이 틀린 칸은 DB에 저장될 때 빠지므로(오늘 수업 집계에서도 빠짐) 한 칸이라도 틀리면 거부
+    if schedule and (not parse_schedule(schedule)
+                     or any(not SLOT_PATTERN.search(part) for part in schedule.split('/'))):
+        return f"시간표 형식 오류: {schedule} (예: 월요일 오후 07:00 / 수요일 오후 07:00)"
+    return None
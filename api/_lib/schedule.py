@@ -0,0 +1,52 @@
+# 수업 시간표 문자열 ↔ 구조화된 인덱스 변환
+# "월요일 오후 07:00 / 수요일 오후 07:00" 같은 문자열을 수업 생성(POST) 시 한 번만 파싱해서
+#   schedule_days  : 요일 번호 목록 (월=0 ... 일=6)  → GIN 인덱스로 "오늘 수업" 조회
+#   schedule_slots : 주 시작(월 00:00)부터의 분 단위 시각 목록 → 정렬 키
+# 로 함께 저장합니다.
+import re
+
+DAY_NAMES = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+DAY_INDEX = {name: i for i, name in enumerate(DAY_NAMES)}
+# 한 칸: '월요일 오후 07:00'
+SLOT_PATTERN = re.compile(r'(월|화|수|목|금|토|일)요일 (오전|오후) (\d{1,2}):(\d{2})')
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# 시작한 지 이 시간(분)이 안 된 수업은 "지금 수업 중"으로 보고 맨 앞에 둠
+IN_PROGRESS_MINUTES = 60
+
+
+def parse_schedule(schedule_str):
+    # 문자열 → 정렬된 schedule_slots
+    # DB 트리거(parse_schedule_slots, supabase/migrations/20261018000500_class_schedule_index.sql)와
+    # 같은 정규식이라 '월요일'이나 '월요일 19:00'처럼 오전/오후와 시각이 없는 칸은 둘 다 건너뜀
+    slots = set()
+    for m in SLOT_PATTERN.finditer(schedule_str or ''):
+        day, ampm, hour, minute = m.groups()
+        hour = int(hour) % 12 + (12 if ampm == '오후' else 0)
+        slots.add(DAY_INDEX[day + '요일'] * MINUTES_PER_DAY + hour * 60 + int(minute))
+    return sorted(slots)
+
+
+def schedule_fields(schedule_str):
+    # classes 행에 같이 저장할 인덱스 컬럼
+    slots = parse_schedule(schedule_str)
+    return {
+        'schedule_days': sorted({slot // MINUTES_PER_DAY for slot in slots}),
+        'schedule_slots': slots,
+    }
+
+
+def minute_of_week(now):
+    return now.weekday() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+
+
+def minutes_until_next(slots, now_minute):
+    # 다음 수업까지 남은 분 (진행 중인 수업은 음수, 시간표가 없으면 None)
+    if not slots:
+        return None
+    return min(
+        (slot - now_minute + IN_PROGRESS_MINUTES) % MINUTES_PER_WEEK - IN_PROGRESS_MINUTES
+        for slot in slots
+    )
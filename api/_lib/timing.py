@@ -0,0 +1,213 @@
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# 요청 단위 시간 측정 (샘플링)
+# - API_TIMING_SAMPLE_RATE (0~1, 기본 0 = 끔) 비율의 요청만 측정 → 운영에서도 켜 둘 수 있음
+# - 측정 중인 요청은
+#     * Supabase .execute() 마다: 쿼리 이름(테이블.동작 / rpc.함수), 행 수, 응답 크기, 시간
+#     * with span('이름'): 으로 감싼 Python 계산 구간의 시간
+#   을 모아서 응답에 Server-Timing 헤더(브라우저 개발자도구 Timing 탭에 표시)를 붙이고,
+#   요청이 끝나면 JSON 한 줄로 로그를 남깁니다. (Vercel 로그에서 grep "timing" 으로 검색)
+# - 측정하지 않는 요청은 contextvar 확인 한 번 외에는 비용이 없습니다.
+
+
+def _sample_rate():
+    try:
+        return min(max(float(os.environ.get('API_TIMING_SAMPLE_RATE', '0')), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+
+SAMPLE_RATE = _sample_rate()
+
+# 현재 요청의 RequestTimer (측정하지 않는 요청이면 None)
+# api/_lib/query.py의 gather()가 작업 스레드로 컨텍스트를 복사하므로 병렬 조회도 같은 요청에 기록됩니다.
+_current = contextvars.ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.status = None
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()  # gather()의 여러 스레드가 동시에 기록
+
+    def add(self, name, kind, ms, rows=None, size=None):
+        span = {'name': name, 'kind': kind, 'ms': round(ms, 2)}
+        if rows is not None:
+            span['rows'] = rows
+        if size is not None:
+            span['bytes'] = size
+        with self._lock:
+            self.spans.append(span)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        # Server-Timing: db;dur=12.3, total;dur=15.0, 0-students.select;dur=4.1;desc="rows=1"
+        with self._lock:
+            spans = list(self.spans)
+        db_ms = sum(s['ms'] for s in spans if s['kind'] == 'db')
+        parts = [f"db;dur={db_ms:.1f}", f"total;dur={self.elapsed_ms():.1f}"]
+        for i, s in enumerate(spans):
+            entry = f"{i}-{_token(s['name'])};dur={s['ms']:.1f}"
+            if 'rows' in s:
+                entry += f';desc="rows={s["rows"]}"'
+            parts.append(entry)
+        return ', '.join(parts)
+
+    def log(self, error=None):
+        with self._lock:
+            spans = list(self.spans)
+        line = {
+            'type': 'timing',
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'total_ms': round(self.elapsed_ms(), 2),
+            'db_ms': round(sum(s['ms'] for s in spans if s['kind'] == 'db'), 2),
+            'queries': sum(1 for s in spans if s['kind'] == 'db'),
+            'spans': spans,
+        }
+        if error is not None:
+            line['error'] = error
+        print(json.dumps(line, ensure_ascii=False))
+
+
+def _token(name):
+    # Server-Timing 이름에는 토큰 문자만 허용
+    return ''.join(c if c.isalnum() or c in '.-_' else '_' for c in name)
+
+
+def current():
+    return _current.get()
+
+
+class span:
+    """with span('sort'): ...  → 측정 중인 요청이면 계산 구간 시간을 기록"""
+
+    def __init__(self, name):
+        self.name = name
+        self.timer = None
+
+    def __enter__(self):
+        self.timer = _current.get()
+        if self.timer is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timer is not None:
+            self.timer.add(self.name, 'app', (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def timed(method):
+    """
+    핸들러의 do_GET/do_POST에 붙이는 데코레이터
+    샘플링된 요청이면 타이머를 시작하고, 끝나면 로그 한 줄을 남깁니다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not SAMPLE_RATE or random.random() >= SAMPLE_RATE:
+            return method(self, *args, **kwargs)
+
+        timer = RequestTimer(self.command, urlparse(self.path).path)
+        token = _current.set(timer)
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception as e:
+            timer.log(error=str(e))
+            raise
+        finally:
+            _current.reset(token)
+        timer.log()
+        return result
+    return wrapper
+
+
+# --- Supabase 클라이언트 래퍼 ---
+
+def _row_count(data):
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
+
+def _size(data):
+    # supabase-py 응답에는 원본 바이트가 없으므로 다시 직렬화한 크기로 추정 (측정 요청에서만)
+    from api._lib.respond import dumps
+    try:
+        return len(dumps(data))
+    except TypeError:
+        return None
+
+
+class _TimedQuery:
+    # 쿼리 빌더를 감싸서 체인 메서드는 그대로 넘기고 .execute()만 측정
+    __slots__ = ('_query', '_name', '_timer')
+
+    def __init__(self, query, name, timer):
+        self._query = query
+        self._name = name
+        self._timer = timer
+
+    def __getattr__(self, attr):
+        value = getattr(self._query, attr)
+        if not callable(value):
+            # .not_ 처럼 빌더를 돌려주는 속성도 다시 감싸야 이후 체인이 측정에서 빠지지 않음
+            return self._wrap(attr, value)
+
+        def call(*args, **kwargs):
+            return self._wrap(attr, value(*args, **kwargs))
+        return call
+
+    def _wrap(self, attr, result):
+        if not hasattr(result, 'execute'):
+            return result
+        name = self._name
+        if attr in ('select', 'insert', 'update', 'upsert', 'delete') and '.' not in name:
+            name = f"{name}.{attr}"
+        return _TimedQuery(result, name, self._timer)
+
+    def execute(self):
+        started = time.perf_counter()
+        res = self._query.execute()
+        ms = (time.perf_counter() - started) * 1000
+        data = getattr(res, 'data', None)
+        self._timer.add(self._name, 'db', ms, rows=_row_count(data), size=_size(data))
+        return res
+
+
+class TimedClient:
+    """
+    api._lib.db.get_client()가 돌려주는 클라이언트
+    측정 중인 요청에서만 쿼리 빌더를 _TimedQuery로 감싸고, 아니면 원래 빌더를 그대로 반환
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        query = self._client.table(name)
+        timer = _current.get()
+        return query if timer is None else _TimedQuery(query, name, timer)
+
+    from_ = table
+
+    def rpc(self, fn, params=None, *args, **kwargs):
+        query = self._client.rpc(fn, params or {}, *args, **kwargs)
+        timer = _current.get()
+        return query if timer is None else _TimedQuery(query, f"rpc.{fn}", timer)
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
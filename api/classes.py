@@ -1,78 +1,63 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
 from datetime import datetime
-from supabase import create_client, Client
-
-# 환경변수 로드 (Vercel 환경)
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+from api._lib.db import get_client
+from api._lib.cache import cached, invalidate
+from api._lib.respond import send_json
+from api._lib.roster import class_row
+from api._lib.timing import span, timed
+from api._lib.schedule import MINUTES_PER_WEEK, minute_of_week, minutes_until_next, parse_schedule
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_GET(self):
+        supabase = get_client()
         # 1. DB에서 모든 수업 데이터 가져오기 (날 것의 데이터)
-        response = supabase.table('classes').select('*').execute()
-        classes = response.data
+        # 탭 여러 개가 동시에 열어도 몇 초 동안은 조회 한 번을 같이 씀 (api/_lib/cache.py)
+        # 정렬은 현재 시각 기준이라 캐시하지 않고 요청마다 계산
+        classes = cached(('classes',), lambda: supabase.table('classes').select('*').execute().data)
 
         # 2. [Python의 강력한 기능] 스마트 정렬 로직 수행
-        # 요일 매핑 (Python은 월요일=0, 일요일=6)
-        # 하지만 우리가 저장한 건 텍스트이므로 매핑 테이블 필요
-        day_map = { '월요일': 0, '화요일': 1, '수요일': 2, '목요일': 3, '금요일': 4, '토요일': 5, '일요일': 6 }
-        
-        today = datetime.now()
-        current_day_idx = today.weekday() # 0~6
-
-        def get_min_dist(schedule_str):
-            # "월요일 오후 07:00 / 수요일 오후 07:00" 같은 문자열 파싱
-            if not schedule_str: return 999
-            
-            slots = schedule_str.split(' / ')
-            min_dist = 999
-            
-            for slot in slots:
-                parts = slot.split(' ') # ['월요일', '오후', '07:00']
-                if not parts: continue
-                
-                day_name = parts[0]
-                target_idx = day_map.get(day_name, 99)
-                
-                # 오늘로부터 며칠 뒤인가? (0이면 오늘)
-                dist = (target_idx - current_day_idx + 7) % 7
-                if dist < min_dist:
-                    min_dist = dist
-            return min_dist
+        # 시간표는 수업 생성 시 schedule_slots(주 단위 분)로 미리 파싱해 두었으므로
+        # 여기서는 "다음 수업까지 남은 분"만 계산합니다. (요일 + 시각까지 반영)
+        now_minute = minute_of_week(datetime.now())
+
+        def sort_key(cls):
+            slots = cls.get('schedule_slots')
+            if slots is None:
+                # 인덱스 컬럼이 비어 있는 옛 데이터만 그 자리에서 파싱
+                slots = parse_schedule(cls.get('schedule', ''))
+            dist = minutes_until_next(slots, now_minute)
+            # 시간표가 없는 수업은 맨 뒤로
+            return dist if dist is not None else MINUTES_PER_WEEK
 
         # Python의 sort는 매우 빠르고 효율적입니다.
-        sorted_classes = sorted(classes, key=lambda x: get_min_dist(x.get('schedule', '')))
+        with span('sort'):
+            sorted_classes = sorted(classes, key=sort_key)
 
         # 3. 정렬된 깨끗한 데이터 반환
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(sorted_classes).encode('utf-8'))
+        send_json(self, sorted_classes)
 
     # POST: 수업 추가 (이건 간단하니까 바로 처리)
+    @timed
     def do_POST(self):
         try:
+            supabase = get_client()
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
             body = json.loads(post_data.decode('utf-8'))
 
+            # 시간표 문자열은 저장 시점에 한 번만 파싱해서 인덱스 컬럼으로 같이 저장
+            body = class_row(body)
+
             # [핵심 수정] .select() 추가
             response = supabase.table('classes').insert(body).execute()
+            # 수업 목록 + 대시보드의 오늘 수업 수
+            invalidate('classes', 'dashboard')
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
             # 데이터가 리스트로 오므로 첫 번째 요소 반환
-            if response.data:
-                self.wfile.write(json.dumps(response.data[0]).encode('utf-8'))
-            else:
-                self.wfile.write(json.dumps({}).encode('utf-8'))
+            send_json(self, response.data[0] if response.data else {})
             
         except Exception as e:
             print(f"Class Create Error: {str(e)}")
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+            send_json(self, {"error": str(e)}, 500)
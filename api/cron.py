@@ -0,0 +1,32 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from api._lib.auth import has_cron_secret
+from api._lib.db import get_client
+from api._lib.jobs import JOBS
+from api._lib.respond import send_json
+from api._lib.timing import timed
+
+# Vercel Cron 전용 엔드포인트 (vercel.json의 crons, 인증은 api/_lib/auth.py)
+# 파라미터: job (api/_lib/jobs.py의 JOBS 이름)
+
+
+class handler(BaseHTTPRequestHandler):
+    @timed
+    def do_GET(self):
+        if not has_cron_secret(self.headers.get('Authorization')):
+            send_json(self, {"error": "인증 실패"}, 401)
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        job = query.get('job', [''])[0]
+        if job not in JOBS:
+            send_json(self, {"error": f"알 수 없는 작업: {job}"}, 400)
+            return
+
+        try:
+            result = JOBS[job](get_client())
+            print(f"Cron {job}: {result}")
+            send_json(self, {"job": job, **result})
+        except Exception as e:
+            print(f"Cron Error ({job}): {str(e)}")
+            send_json(self, {"error": str(e)}, 500)
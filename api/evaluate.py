@@ -1,59 +1,148 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
-from supabase import create_client, Client
+from datetime import date
 from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.query import gather
+from api._lib.curriculum import get_curriculum
+from api._lib.recommend_engine import STORED_COLUMNS, decide, format_reason
+from api._lib.cache import invalidate
+from api._lib.respond import send_json
+from api._lib.timing import span, timed
+
+# 평가 화면용 추천 문구
+REASONS = {
+    'first': "첫 수업이네요! 기초 단원부터 시작하는 것을 추천해요.",
+    'review': "지난 성취도({score}점)가 낮아 복습을 추천합니다.",
+    'next': "지난 수업({score}점) 이해도가 높습니다! '{title}' 진도를 추천합니다.",
+    'complete': "커리큘럼을 완주했습니다! 심화 학습 단계입니다.",
+}
+
+# 일괄 평가 저장 한 번에 받을 수 있는 최대 행 수
+MAX_BULK_ROWS = 500
+
+# daily_logs에 저장하는 컬럼 (이외의 키는 거부)
+EVALUATION_FIELDS = ('student_id', 'score', 'selected_units', 'homework', 'attitude', 'teacher_comment', 'log_date')
+
+
+def _validate_evaluation(item, today):
+    # (저장할 행, 에러 메시지)
+    if not isinstance(item, dict):
+        return None, "평가 데이터는 객체여야 합니다."
+
+    unknown = [k for k in item if k not in EVALUATION_FIELDS]
+    if unknown:
+        return None, f"알 수 없는 필드: {', '.join(unknown)}"
+
+    student_id = item.get('student_id')
+    if student_id in (None, '') or isinstance(student_id, bool):
+        return None, "student_id가 필요합니다."
+
+    score = item.get('score')
+    if score is not None and (isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100):
+        return None, "score는 0~100 사이 숫자여야 합니다."
+
+    units = item.get('selected_units')
+    if units is not None and (not isinstance(units, list) or not all(isinstance(u, int) and not isinstance(u, bool) for u in units)):
+        return None, "selected_units는 단원 ID(정수) 배열이어야 합니다."
+
+    log_date = item.get('log_date') or today
+    try:
+        date.fromisoformat(log_date)
+    except (TypeError, ValueError):
+        return None, "log_date는 YYYY-MM-DD 형식이어야 합니다."
+
+    row = {field: item[field] for field in EVALUATION_FIELDS if field in item}
+    row['log_date'] = log_date
+    return row, None
+
+
+def _bulk_upsert(supabase, items):
+    # 검증 → 다중 행 upsert 한 번 → 행별 결과
+    # (행마다 보낸 컬럼이 달라도 default_to_null=False로 빠진 컬럼은 DB 기본값 사용)
+    today = date.today().isoformat()
+    results = []
+    rows = {}  # (student_id, log_date) -> (결과 위치, 행)
+
+    for index, item in enumerate(items):
+        row, error = _validate_evaluation(item, today)
+        student_id = item.get('student_id') if isinstance(item, dict) else None
+        results.append({"index": index, "student_id": student_id, "status": "error" if error else "ok"})
+        if error:
+            results[index]["error"] = error
+            continue
+
+        # 같은 요청 안에 같은 학생/같은 날이 두 번 있으면 마지막 것만 저장 (한 문장 upsert 제약)
+        key = (str(row['student_id']), row['log_date'])
+        if key in rows:
+            earlier = rows[key][0]
+            results[earlier]["status"] = "duplicate"
+            results[earlier]["error"] = f"같은 요청의 {index}번 행으로 대체되었습니다."
+        rows[key] = (index, row)
+
+    if not rows:
+        return results
+
+    try:
+        saved = supabase.table('daily_logs')\
+            .upsert([row for _, row in rows.values()], on_conflict='student_id,log_date', default_to_null=False)\
+            .execute().data or []
+        saved_ids = {(str(r['student_id']), r['log_date']): r.get('id') for r in saved}
+        for key, (index, _) in rows.items():
+            results[index]["id"] = saved_ids.get(key)
+    except Exception as e:
+        # 한 행 때문에 전체 문장이 실패한 경우(예: 없는 학생 ID)에만 행별로 다시 시도해 원인을 보고
+        print(f"Bulk Evaluation Error: {str(e)}")
+        for key, (index, row) in rows.items():
+            try:
+                saved = supabase.table('daily_logs').upsert(row, on_conflict='student_id,log_date').execute().data
+                results[index]["id"] = saved[0].get('id') if saved else None
+            except Exception as row_error:
+                results[index]["status"] = "error"
+                results[index]["error"] = str(row_error)
+
+    return results
 
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_GET(self):
+        supabase = get_client()
         # 파라미터: student_id
         query = parse_qs(urlparse(self.path).query)
         student_id = query.get('student_id', [None])[0]
         
         if not student_id:
-            self.send_response(400)
-            self.end_headers()
+            send_json(self, {"error": "student_id가 필요합니다."}, 400)
             return
 
-        # 1. [병렬 조회 효과] 학생 정보 & 커리큘럼 & 최근 기록 가져오기
-        student_res = supabase.table('students').select('*').eq('id', student_id).single().execute()
-        curriculum_res = supabase.table('curriculum').select('*').order('id').execute()
-        logs_res = supabase.table('daily_logs').select('*').eq('student_id', student_id).order('created_at', desc=True).limit(1).execute()
+        # 1. 학생 정보 + 미리 계산된 추천(recommendations)을 한 번에, 커리큘럼은 동시에
+        # (커리큘럼은 프로세스 캐시에서 가져오므로 대부분 DB 왕복이 없습니다)
+        student_res, (curriculum, curriculum_index) = gather(
+            # .single()은 학생이 없으면 예외를 던져 연결이 그냥 끊기므로 limit(1)로 받고 404 처리
+            supabase.table('students').select(f'*, recommendations({STORED_COLUMNS})').eq('id', student_id).limit(1),
+            lambda: get_curriculum(supabase),
+        )
         
-        student = student_res.data
-        curriculum = curriculum_res.data
-        last_log = logs_res.data[0] if logs_res.data else None
-
-        # 2. [AI 로직] 파이썬 내부에서 계산
-        next_unit_ids = []
-        reason = ""
-
-        if not last_log:
-            if curriculum:
-                next_unit_ids = [curriculum[0]['id']]
-                reason = "첫 수업이네요! 기초 단원부터 시작하는 것을 추천해요."
-        else:
-            last_units = last_log.get('selected_units', [])
-            last_score = last_log.get('score', 0)
-            last_max_id = max(last_units) if last_units else 0
-            
-            if last_score < 70:
-                next_unit_ids = [last_max_id]
-                reason = f"지난 성취도({last_score}점)가 낮아 복습을 추천합니다."
-            else:
-                # 다음 단원 찾기
-                current_idx = next((i for i, item in enumerate(curriculum) if item['id'] == last_max_id), -1)
-                if current_idx != -1 and current_idx < len(curriculum) - 1:
-                    next_unit = curriculum[current_idx + 1]
-                    next_unit_ids = [next_unit['id']]
-                    reason = f"지난 수업({last_score}점) 이해도가 높습니다! '{next_unit['title']}' 진도를 추천합니다."
-                else:
-                    next_unit_ids = [last_max_id]
-                    reason = "커리큘럼을 완주했습니다! 심화 학습 단계입니다."
+        if not student_res.data:
+            send_json(self, {"error": "학생을 찾을 수 없습니다."}, 404)
+            return
+
+        student = student_res.data[0]
+        decision = student.pop('recommendations', None)
+        if isinstance(decision, list):
+            decision = decision[0] if decision else None
+
+        # 2. [AI 로직] 미리 계산된 추천이 없으면(오늘 새 기록이 생겼거나 배치 전) 최근 기록으로 즉시 계산
+        # (규칙은 recommend_engine 공용, 야간 배치: api/cron.py?job=recommendations)
+        if decision is None:
+            logs_res = supabase.table('daily_logs').select('*').eq('student_id', student_id)\
+                .order('created_at', desc=True).limit(1).execute()
+            with span('recommend'):
+                decision = decide(logs_res.data[0] if logs_res.data else None, curriculum, curriculum_index)
+
+        next_unit_ids = decision['unit_ids']
+        reason = format_reason(decision, REASONS)
 
         # 3. 데이터 패키징 (한 번에 반환)
         response_data = {
@@ -65,27 +154,48 @@ class handler(BaseHTTPRequestHandler):
             }
         }
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response_data).encode('utf-8'))
+        send_json(self, response_data)
 
+    @timed
     def do_POST(self):
+        # 평가 저장
+        # - 단일: { student_id, score, selected_units, ... }  → { success }
+        # - 일괄: [ {...}, {...} ] 또는 { evaluations: [...] } → 행별 결과
+        # 모두 (student_id, log_date) 기준 upsert라 같은 요청을 다시 보내도 중복 저장되지 않습니다.
         try:
+            supabase = get_client()
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
             body = json.loads(post_data.decode('utf-8'))
 
-            # [수정] 결과를 response 하나로 받기
-            response = supabase.table('daily_logs').insert(body).execute()
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"success": True}).encode('utf-8'))
+            if isinstance(body, dict) and 'evaluations' not in body:
+                # 단일 저장 (기존 프론트엔드 호출 방식)
+                row, error = _validate_evaluation(body, date.today().isoformat())
+                if error:
+                    send_json(self, {"error": error}, 400)
+                    return
+
+                supabase.table('daily_logs').upsert(row, on_conflict='student_id,log_date').execute()
+                # 대시보드의 오늘 평가 수/집중 케어 학생이 바뀜
+                invalidate('dashboard')
+
+                send_json(self, {"success": True})
+                return
+
+            items = body if isinstance(body, list) else body.get('evaluations')
+            if not isinstance(items, list) or len(items) > MAX_BULK_ROWS:
+                send_json(self, {"error": f"evaluations는 최대 {MAX_BULK_ROWS}건의 배열이어야 합니다."}, 400)
+                return
+
+            results = _bulk_upsert(supabase, items)
+            invalidate('dashboard')
+
+            send_json(self, {
+                "success": all(r['status'] == 'ok' for r in results),
+                "saved": sum(1 for r in results if r['status'] == 'ok'),
+                "results": results
+            })
             
         except Exception as e:
             print(f"Evaluation Error: {str(e)}")
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
\ No newline at end of file
+            send_json(self, {"error": str(e)}, 500)
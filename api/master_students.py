@@ -1,42 +1,77 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
-from supabase import create_client, Client
+import base64
+from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.cache import invalidate
+from api._lib.respond import send_json
+from api._lib.phone import normalize_phone
+from api._lib.roster import student_row
+from api._lib.timing import timed
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# 전화번호 부분 검색에 쓰는 최소 숫자 수
+MIN_PHONE_DIGITS = 3
+
+# fields= 로 요청할 수 있는 컬럼 (임의 컬럼/조인 주입 방지)
+STUDENT_FIELDS = {
+    'id', 'name', 'school_name', 'phone_number', 'parent_phone_1', 'parent_phone_2',
+    'grade', 'avatar_color', 'class_id', 'parent_user_id', 'created_at'
+}
+
+
+def _parse_fields(fields_param):
+    if not fields_param:
+        return '*'
+    fields = [f.strip() for f in fields_param.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in STUDENT_FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+    # 커서를 만들려면 name, id는 항상 필요
+    for required in ('id', 'name'):
+        if required not in fields:
+            fields.append(required)
+    return ','.join(fields)
+
+
+def _encode_cursor(name, student_id):
+    raw = json.dumps([name, student_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_cursor(cursor):
+    try:
+        name, student_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("잘못된 cursor 값")
+    return name, student_id
+
+
+def _quote(value):
+    # PostgREST 필터 값 인용 (이름에 쉼표/괄호가 있어도 안전하게)
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
 
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_POST(self):
         try:
-            if not url or not key: raise ValueError("환경변수 누락")
-            supabase: Client = create_client(url, key)
+            supabase = get_client()
 
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
             body = json.loads(post_data.decode('utf-8'))
             
-            # 데이터 가공
-            school_type = body.get('school_type', '')
-            grade_num = body.get('grade_num', '')
-            final_grade = f"{school_type}{grade_num}" if school_type and grade_num else body.get('grade', '')
-            
-            new_student = {
-                "name": body.get('name'),
-                "school_name": body.get('school_name'),
-                "phone_number": body.get('phone_number'),
-                "parent_phone_1": body.get('parent_phone_1'),
-                "grade": final_grade,
-                "avatar_color": body.get('avatar_color')
-            }
+            # 데이터 가공 (학년 school_type + grade_num → '중2', 규칙은 api/_lib/roster.py)
+            new_student = student_row(body)
 
             # [핵심 수정] .select() 제거 -> 그냥 .execute() 만 호출
             # 대부분의 버전에서 insert는 기본적으로 데이터를 반환하거나, 적어도 에러는 안 냅니다.
             response = supabase.table('students').insert(new_student).execute()
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
+            # 대시보드의 전체 원생 수
+            invalidate('dashboard')
             
             # 데이터가 있으면 반환, 없으면 입력한 데이터 그대로 반환 (프론트엔드 에러 방지)
             if response.data:
@@ -45,37 +80,60 @@ class handler(BaseHTTPRequestHandler):
                 # 만약 DB가 데이터를 안 돌려줬다면, 우리가 보낸 데이터라도 돌려줘서 성공 처리
                 data_to_return = [new_student]
 
-            self.wfile.write(json.dumps({"success": True, "data": data_to_return}).encode('utf-8'))
+            send_json(self, {"success": True, "data": data_to_return})
 
         except Exception as e:
             error_message = f"{type(e).__name__}: {str(e)}"
             print(f"🔥 Student Error: {error_message}")
             
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": error_message}).encode('utf-8'))
+            send_json(self, {"error": error_message}, 500)
 
+    @timed
     def do_GET(self):
         try:
-            if not url or not key: raise ValueError("환경변수 누락")
-            supabase: Client = create_client(url, key)
+            supabase = get_client()
             
-            from urllib.parse import urlparse, parse_qs
             query_params = parse_qs(urlparse(self.path).query)
             search_term = query_params.get('q', [''])[0]
+
+            # [페이지네이션] (name, id) 기준 keyset 방식 - 몇 페이지째든 인덱스 한 번 탐색으로 끝남
+            # - limit : 페이지 크기 (기본 100, 최대 500)
+            # - cursor: 이전 응답의 X-Next-Cursor 헤더 값
+            # - fields: 필요한 컬럼만 (예: fields=id,name,grade)
+            try:
+                limit = min(max(int(query_params.get('limit', [DEFAULT_PAGE_SIZE])[0]), 1), MAX_PAGE_SIZE)
+                columns = _parse_fields(query_params.get('fields', [''])[0])
+                cursor = query_params.get('cursor', [''])[0]
+                after = _decode_cursor(cursor) if cursor else None
+            except ValueError as e:
+                send_json(self, {"error": str(e)}, 400)
+                return
             
-            db_query = supabase.table('students').select('*').order('name')
+            db_query = supabase.table('students').select(columns).order('name').order('id')
             if search_term:
-                db_query = db_query.or_(f"name.ilike.%{search_term}%,phone_number.ilike.%{search_term}%")
-            
-            response = db_query.execute()
+                # 이름은 trigram 인덱스, 전화번호는 하이픈을 뺀 phone_digits로 비교
+                # (순위가 필요한 검색은 /api/search 사용)
+                # (숫자가 3자리 미만이면 거의 모든 번호에 걸리므로 이름으로만 - search_students()와 같은 규칙)
+                conditions = [f"name.ilike.{_quote(f'%{search_term}%')}"]
+                digits = normalize_phone(search_term)
+                if len(digits) >= MIN_PHONE_DIGITS:
+                    conditions.append(f"phone_digits.like.{_quote(f'%{digits}%')}")
+                db_query = db_query.or_(','.join(conditions))
+            if after:
+                last_name, last_id = after
+                db_query = db_query.or_(
+                    f"name.gt.{_quote(last_name)},and(name.eq.{_quote(last_name)},id.gt.{_quote(last_id)})"
+                )
+
+            # 한 건 더 받아서 다음 페이지 존재 여부 판단
+            rows = db_query.limit(limit + 1).execute().data
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = _encode_cursor(rows[-1]['name'], rows[-1]['id'])
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response.data).encode('utf-8'))
+            # 응답 본문은 기존처럼 배열 그대로 두고, 다음 페이지 커서는 헤더로 전달
+            # (목록이 그대로면 ETag가 같아 폴링/재검색 시 304로 끝남)
+            send_json(self, rows, headers={'X-Next-Cursor': next_cursor} if next_cursor else None)
         except Exception as e:
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
\ No newline at end of file
+            send_json(self, {"error": str(e)}, 500)
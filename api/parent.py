@@ -1,66 +1,72 @@
 from http.server import BaseHTTPRequestHandler
-import json
-import os
-from supabase import create_client, Client
 from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.cache import TTLCache
+from api._lib.respond import send_json
+from api._lib.timing import span, timed
+
+# 학부모는 선생님이 기록을 쓰는 것보다 훨씬 자주 이 화면을 새로고침하므로
+# 스냅샷을 짧게(초 단위) 캐시합니다. 새 평가는 최대 SNAPSHOT_TTL초 뒤에 보입니다.
+SNAPSHOT_TTL = 15
+_snapshot_cache = TTLCache(ttl=SNAPSHOT_TTL, maxsize=512)
+
+
+def _stats_from(child):
+    # student_stats(최근 30건 기준)를 화면용 통계로 변환
+    stats = child.get('student_stats') if child else None
+    if isinstance(stats, list):
+        stats = stats[0] if stats else None
+    if not stats or not stats.get('recent_scores'):
+        return {"avgScore": 0, "attendance": 0}
+    return {
+        "avgScore": round(stats['recent_avg'] or 0),
+        "attendance": len(stats['recent_scores'])
+    }
 
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_GET(self):
+        supabase = get_client()
         query = parse_qs(urlparse(self.path).query)
         parent_id = query.get('parent_id', [None])[0]
         selected_child_id = query.get('child_id', [None])[0]
 
         if not parent_id:
-            self.send_response(400)
-            self.end_headers()
+            send_json(self, {"error": "parent_id가 필요합니다."}, 400)
             return
 
-        response_data = {
-            "children": [],
-            "logs": [],
-            "stats": {"avgScore": 0, "attendance": 0}
-        }
+        # 1. 스냅샷: 자녀 목록(반 정보 + 누적 통계) + 자녀별 최근 30개 기록을 RPC 한 번으로
+        # (정의: supabase/migrations/20261018001000_parent_snapshot.sql)
+        snapshot = _snapshot_cache.get(parent_id)
+        if snapshot is None:
+            snapshot = supabase.rpc('parent_snapshot', {'p_parent_id': parent_id}).execute().data or {}
+            _snapshot_cache.set(parent_id, snapshot)
 
-        # 1. 자녀 목록 가져오기 (반 정보 포함)
-        # Note: supabase-py에서는 nested query 문법이 조금 다를 수 있어 안전하게 따로 호출하거나 조인 사용
-        # 여기서는 간단하게 students 가져오고 class info는 필요시 추가 조회하는 방식 추천하지만,
-        # MVP 속도를 위해 join string 사용
-        children_res = supabase.table('students')\
-            .select('*, classes(name, schedule)')\
-            .eq('parent_user_id', parent_id)\
-            .execute()
-        
-        response_data["children"] = children_res.data
+        children = snapshot.get('children') or []
+        logs_by_child = snapshot.get('logs') or {}
 
-        # 2. 특정 자녀의 데이터 분석 (child_id가 있거나, 자녀가 1명이면 자동 선택)
-        target_id = selected_child_id if selected_child_id else (children_res.data[0]['id'] if children_res.data else None)
+        # 모든 자녀의 기록/통계를 같이 내려줘서, 자녀 전환 시 추가 호출 없이 화면 갱신 가능
+        with span('shape'):
+            by_child = {
+                str(child['id']): {
+                    "logs": logs_by_child.get(str(child['id']), []),
+                    "stats": _stats_from(child)
+                }
+                for child in children
+            }
 
-        if target_id:
-            # 최근 30개 기록 조회
-            logs_res = supabase.table('daily_logs')\
-                .select('*')\
-                .eq('student_id', target_id)\
-                .order('created_at', desc=True)\
-                .limit(30)\
-                .execute()
-            
-            logs = logs_res.data
-            response_data["logs"] = logs
+        response_data = {
+            "children": children,
+            "logs": [],
+            "stats": {"avgScore": 0, "attendance": 0},
+            "by_child": by_child
+        }
 
-            # [Python 통계 계산]
-            if logs:
-                scores = [log['score'] for log in logs if log['score'] is not None]
-                avg_score = sum(scores) / len(scores) if scores else 0
-                response_data["stats"] = {
-                    "avgScore": round(avg_score),
-                    "attendance": len(logs)
-                }
+        # 2. 특정 자녀의 데이터 (child_id가 있거나, 없으면 첫 번째 자녀 자동 선택) - 기존 응답 형태 유지
+        target_id = selected_child_id if selected_child_id else (children[0]['id'] if children else None)
+        if target_id is not None and str(target_id) in by_child:
+            response_data["logs"] = by_child[str(target_id)]["logs"]
+            response_data["stats"] = by_child[str(target_id)]["stats"]
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response_data).encode('utf-8'))
\ No newline at end of file
+        send_json(self, response_data)
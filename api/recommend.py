@@ -1,80 +1,114 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
-from supabase import create_client, Client
+from api._lib.db import get_client
+from api._lib.query import gather
+from api._lib.curriculum import get_curriculum
+from api._lib.recommend_engine import STORED_COLUMNS, decide, format_reason
+from api._lib.respond import send_json
+from api._lib.timing import span, timed
+
+
+# 추천 문구 (규칙 자체는 api/_lib/recommend_engine.py)
+# --- [대표님의 철학이 담긴 알고리즘] ---
+# "보통 전날 수업한 내용 복습 혹은 다음 내용을 학습하니까..."
+REASONS = {
+    'first': "첫 수업이네요! 커리큘럼의 첫 단원부터 시작합니다.",
+    'review': "지난 수업 성취도({score}점)가 조금 부족했어요. 오늘은 확실히 복습하고 넘어갈까요?",
+    'next': "지난 수업({score}점)을 완벽히 소화했네요! 오늘은 '{title}' 진도를 나갈 차례입니다.",
+    'complete': "커리큘럼을 모두 마쳤습니다! 심화 학습을 진행해볼까요?",
+}
+
+
+def recommend_next(last_log, curriculum, curriculum_index):
+    # (추천 단원 ID 목록, 추천 이유) - 단일/배치 모드가 같은 함수를 씁니다.
+    decision = decide(last_log, curriculum, curriculum_index)
+    return decision['unit_ids'], format_reason(decision, REASONS)
 
-# Vercel이 자동으로 환경변수를 가져옵니다.
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_POST(self):
-        # 1. 프론트엔드에서 보낸 데이터(학생 ID) 받기
+        supabase = get_client()
+        # 1. 프론트엔드에서 보낸 데이터 받기
+        # - 단일: { student_id }
+        # - 배치: { student_ids: [...] } 또는 { class_id } → 반 전체를 한 번에 추천
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
         body = json.loads(post_data.decode('utf-8'))
-        student_id = body.get('student_id')
 
+        if body.get('student_ids') is not None or body.get('class_id'):
+            response_data = self._recommend_batch(supabase, body)
+        else:
+            response_data = self._recommend_single(supabase, body.get('student_id'))
+
+        # 4. 결과 돌려주기
+        send_json(self, response_data)
+
+    def _recommend_single(self, supabase, student_id):
         # 2. DB에서 데이터 가져오기 (학생의 과거 기록 & 전체 커리큘럼)
         # (이 부분은 Python이라 데이터 분석 라이브러리 pandas 등을 쓰기 아주 좋습니다)
-        logs_response = supabase.table('daily_logs')\
-            .select('*')\
-            .eq('student_id', student_id)\
-            .order('created_at', desc=True)\
-            .limit(5)\
-            .execute() # 최근 5건 조회 (패턴 분석용)
-            
-        curriculum_response = supabase.table('curriculum').select('*').order('id').execute()
-        
-        logs = logs_response.data
-        curriculum = curriculum_response.data
-        
-        # 3. [핵심] 진도 추천 알고리즘 (Python Logic)
-        next_unit_ids = []
-        reason = ""
-
-        if not logs:
-            # 기록 없으면 1단원
-            if curriculum:
-                next_unit_ids = [curriculum[0]['id']]
-                reason = "첫 수업이네요! 커리큘럼의 첫 단원부터 시작합니다."
+        # 야간 배치가 미리 계산해 둔 추천을 먼저 보고, 없을 때만 최근 기록으로 계산
+        # (커리큘럼은 프로세스 캐시에서 가져오므로 대부분 DB 왕복이 없습니다)
+        stored_res, (curriculum, curriculum_index) = gather(
+            supabase.table('recommendations').select(STORED_COLUMNS).eq('student_id', student_id).limit(1),
+            lambda: get_curriculum(supabase),
+        )
+
+        if stored_res.data:
+            decision = stored_res.data[0]
         else:
-            last_log = logs[0]
-            last_units = last_log.get('selected_units', [])
-            last_score = last_log.get('score', 0)
-            
-            # 마지막으로 배운 단원의 ID (여러 개면 가장 큰 숫자 기준)
-            last_max_id = max(last_units) if last_units else 0
-            
-            # --- [대표님의 철학이 담긴 알고리즘] ---
-            # "보통 전날 수업한 내용 복습 혹은 다음 내용을 학습하니까..."
-            
-            if last_score < 70:
-                # 점수가 낮으면 -> 선생님은 보통 '복습'을 선택할 것이다.
-                next_unit_ids = [last_max_id]
-                reason = f"지난 수업 성취도({last_score}점)가 조금 부족했어요. 오늘은 확실히 복습하고 넘어갈까요?"
-            else:
-                # 점수가 높으면 -> 선생님은 '다음 진도'를 선택할 것이다.
-                # 현재 단원의 다음 단원 찾기
-                current_idx = next((i for i, item in enumerate(curriculum) if item['id'] == last_max_id), -1)
-                
-                if current_idx != -1 and current_idx < len(curriculum) - 1:
-                    next_unit = curriculum[current_idx + 1]
-                    next_unit_ids = [next_unit['id']]
-                    reason = f"지난 수업({last_score}점)을 완벽히 소화했네요! 오늘은 '{next_unit['title']}' 진도를 나갈 차례입니다."
-                else:
-                    # 다음 단원이 없으면 (마지막 단원)
-                    next_unit_ids = [last_max_id]
-                    reason = "커리큘럼을 모두 마쳤습니다! 심화 학습을 진행해볼까요?"
+            # 최근 5건(패턴 분석용)
+            logs = supabase.table('daily_logs')\
+                .select('*')\
+                .eq('student_id', student_id)\
+                .order('created_at', desc=True)\
+                .limit(5)\
+                .execute().data
+            decision = decide(logs[0] if logs else None, curriculum, curriculum_index)
 
-        # 4. 결과 돌려주기
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        
-        response_data = {
-            "recommended_unit_ids": next_unit_ids,
-            "reason": reason
+        # 3. 진도 추천
+        return {
+            "recommended_unit_ids": decision['unit_ids'],
+            "reason": format_reason(decision, REASONS)
         }
-        self.wfile.write(json.dumps(response_data).encode('utf-8'))
\ No newline at end of file
+
+    def _recommend_batch(self, supabase, body):
+        # 학생별 최신 기록은 latest_daily_logs 뷰(DISTINCT ON)에서 쿼리 한 번으로 가져옵니다.
+        # 뷰는 DISTINCT ON 키인 student_id로만 거릅니다. (class_id로 거르면 Postgres가 조건을
+        # DISTINCT ON 아래로 내리지 못해 daily_logs 전체를 정렬함)
+        # 학생 20명이어도 왕복은 최대 2회 (+ 캐시된 커리큘럼)
+        class_id = body.get('class_id')
+        latest_logs = supabase.table('latest_daily_logs').select('student_id, score, selected_units')
+
+        if class_id:
+            # 기록이 없는 학생도 '첫 수업' 추천을 받아야 하므로 반 명단을 먼저 조회
+            students_res, (curriculum, curriculum_index) = gather(
+                supabase.table('students').select('id').eq('class_id', class_id).order('name'),
+                lambda: get_curriculum(supabase),
+            )
+            student_ids = [s['id'] for s in students_res.data]
+            logs_res = latest_logs.in_('student_id', student_ids).execute() if student_ids else None
+        else:
+            student_ids = body.get('student_ids') or []
+            if student_ids:
+                logs_res, (curriculum, curriculum_index) = gather(
+                    latest_logs.in_('student_id', student_ids),
+                    lambda: get_curriculum(supabase),
+                )
+            else:
+                logs_res, (curriculum, curriculum_index) = None, get_curriculum(supabase)
+
+        # student_id는 쿼리스트링/JSON에서 문자열로 올 수 있어 문자열 키로 맞춤
+        last_log_by_student = {str(log['student_id']): log for log in (logs_res.data if logs_res else [])}
+
+        recommendations = []
+        with span('recommend'):
+            for sid in student_ids:
+                next_unit_ids, reason = recommend_next(last_log_by_student.get(str(sid)), curriculum, curriculum_index)
+                recommendations.append({
+                    "student_id": sid,
+                    "recommended_unit_ids": next_unit_ids,
+                    "reason": reason
+                })
+
+        return {"recommendations": recommendations}
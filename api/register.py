@@ -1,48 +1,66 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
-from supabase import create_client, Client
-
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+from api._lib.auth import has_cron_secret
+from api._lib.db import get_client
+from api._lib.phone import normalize_phone
+from api._lib.respond import send_json
+from api._lib.timing import timed
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_POST(self):
+        supabase = get_client()
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
         body = json.loads(post_data.decode('utf-8'))
-        
+
+        # 일괄 재매칭: { mode: 'rematch' } (관리용, Authorization: Bearer <CRON_SECRET>)
+        # 학기 초 명단을 한꺼번에 등록한 뒤, 먼저 가입해 둔 학부모들을 update 한 번으로 연결
+        if body.get('mode') == 'rematch':
+            if not has_cron_secret(self.headers.get('Authorization')):
+                send_json(self, {"error": "인증 실패"}, 401)
+                return
+            # jobs는 추천/위험 판정 모듈까지 불러오므로 가입 요청의 콜드 스타트에 넣지 않도록 여기서 import
+            from api._lib.jobs import run_parent_rematch
+            try:
+                send_json(self, {"success": True, **run_parent_rematch(supabase)})
+            except Exception as e:
+                print(f"Rematch Error: {str(e)}")
+                send_json(self, {"error": str(e)}, 500)
+            return
+
         user_id = body.get('user_id')
         role = body.get('role')
         phone = body.get('phone')
 
         if not user_id or not role:
-            self.send_response(400)
-            self.end_headers()
+            send_json(self, {"error": "user_id와 role이 필요합니다."}, 400)
             return
 
         try:
-            # 1. 역할(Role) 저장
-            supabase.table('user_roles').insert({'id': user_id, 'role': role}).execute()
+            phone_digits = normalize_phone(phone)
+
+            # 1. 역할(Role) 저장 (정규화한 번호도 같이 저장 → 학생이 나중에 등록돼도 재매칭 가능)
+            supabase.table('user_roles').insert({
+                'id': user_id,
+                'role': role,
+                'phone_digits': phone_digits or None
+            }).execute()
 
             # 2. [비즈니스 로직] 학부모일 경우 자녀 자동 매칭
             match_count = 0
-            if role == 'parent' and phone:
+            if role == 'parent' and phone_digits:
                 # 전화번호가 일치하는 학생 찾아서 부모 ID 업데이트
-                # (하이픈 '-' 유무와 상관없이 찾기 위해 간단한 처리 가능하지만 여기선 그대로 매칭)
+                # (하이픈 '-' 유무와 상관없이 숫자만 정규화한 *_digits 컬럼으로 매칭, 학부모 번호 1/2 모두)
+                # 이미 다른 학부모(예: 번호 1의 어머니)와 연결된 학생은 건드리지 않음 (rematch_parents와 같은 규칙)
                 res = supabase.table('students')\
                     .update({'parent_user_id': user_id})\
-                    .eq('parent_phone_1', phone)\
+                    .or_(f'parent_phone_1_digits.eq.{phone_digits},parent_phone_2_digits.eq.{phone_digits}')\
+                    .is_('parent_user_id', 'null')\
                     .execute()
                 match_count = len(res.data)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"success": True, "matched": match_count}).encode('utf-8'))
+            send_json(self, {"success": True, "matched": match_count})
 
         except Exception as e:
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
\ No newline at end of file
+            send_json(self, {"error": str(e)}, 500)
@@ -0,0 +1,40 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.respond import send_json
+from api._lib.timing import timed
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+class handler(BaseHTTPRequestHandler):
+    @timed
+    def do_GET(self):
+        # 학생 검색: 이름 또는 전화번호(학생/학부모, 하이픈 무관)
+        # 파라미터: q (검색어), limit (기본 20, 최대 100)
+        try:
+            supabase = get_client()
+            query = parse_qs(urlparse(self.path).query)
+            search_term = query.get('q', [''])[0].strip()
+
+            if not search_term:
+                send_json(self, {"error": "검색어(q)가 필요합니다."}, 400)
+                return
+            try:
+                limit = min(max(int(query.get('limit', [DEFAULT_LIMIT])[0]), 1), MAX_LIMIT)
+            except ValueError:
+                send_json(self, {"error": "limit은 숫자여야 합니다."}, 400)
+                return
+
+            # trigram 인덱스를 타는 DB 함수에서 랭킹까지 계산해서 받음 (rank 내림차순)
+            # (정의: supabase/migrations/20261018000700_student_search.sql)
+            results = supabase.rpc('search_students', {
+                'p_query': search_term,
+                'p_limit': limit
+            }).execute().data or []
+
+            send_json(self, results)
+
+        except Exception as e:
+            print(f"Search Error: {str(e)}")
+            send_json(self, {"error": str(e)}, 500)
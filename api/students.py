@@ -1,16 +1,21 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import os
 from datetime import datetime, timezone
-from supabase import create_client, Client
 from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.cache import invalidate
+from api._lib.respond import send_json
+from api._lib.timing import timed
+
+# mode=available 로 돌려주는 후보 수 (limit= 로 조정)
+DEFAULT_AVAILABLE_LIMIT = 100
+MAX_AVAILABLE_LIMIT = 500
 
-url: str = os.environ.get("VITE_SUPABASE_URL")
-key: str = os.environ.get("VITE_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
 
 class handler(BaseHTTPRequestHandler):
+    @timed
     def do_GET(self):
+        supabase = get_client()
         # URL 파라미터 파싱
         query = parse_qs(urlparse(self.path).query)
         mode = query.get('mode', ['list'])[0] # 'list'(반 학생) or 'available'(배정 가능 학생)
@@ -21,64 +26,97 @@ class handler(BaseHTTPRequestHandler):
         if mode == 'list' and class_id:
             # [기능 1] 반에 소속된 학생 목록 + 오늘 평가 완료 여부 확인
             
-            # 1. 학생 목록 가져오기
-            st_res = supabase.table('students').select('*').eq('class_id', class_id).order('name').execute()
-            students = st_res.data
-            
-            # 2. 오늘 날짜 기록 확인 (Python에서 날짜 처리)
             today_str = datetime.now().strftime('%Y-%m-%d')
-            
-            # 오늘자 로그 가져오기
-            log_res = supabase.table('daily_logs')\
-                .select('student_id')\
-                .in_('student_id', [s['id'] for s in students])\
-                .gte('created_at', f"{today_str}T00:00:00")\
-                .execute()
-            
-            completed_ids = [log['student_id'] for log in log_res.data]
-            
-            # 3. 데이터 합치기
-            for s in students:
-                s['isCompleted'] = s['id'] in completed_ids
-            
-            data_to_return = students
+            since = f"{today_str}T00:00:00"
+
+            try:
+                # DB 함수가 학생마다 exists 서브쿼리로 isCompleted를 붙여서 돌려줌 (왕복 1회)
+                # (정의: supabase/migrations/20261018000400_class_students_with_status.sql)
+                data_to_return = supabase.rpc('class_students_with_status', {
+                    'p_class_id': class_id,
+                    'p_since': since
+                }).execute().data or []
+            except Exception as e:
+                print(f"class_students_with_status RPC Error: {str(e)}")
+                send_json(self, {"error": str(e)}, 500)
+                return
 
         elif mode == 'available':
             # [기능 2] 배정 가능한 학생 목록 + 스마트 정렬(추천)
             target_grade = query.get('target_grade', [''])[0] # 예: "중1"
-            
-            # 반이 없는 학생들 조회
-            res = supabase.table('students').select('*').is_('class_id', 'null').order('grade').execute()
-            available_students = res.data
-            
-            # Python 정렬: 타겟 학년과 일치하면 우선순위 높임
-            def sort_key(student):
-                # 일치하면 0 (맨 앞), 아니면 1
-                return 0 if student.get('grade') == target_grade else 1
-            
-            data_to_return = sorted(available_students, key=sort_key)
+            # 상위 limit명 밖의 학생은 이름(q)으로 찾음
+            name_query = query.get('q', [''])[0].strip()
+            try:
+                limit = min(max(int(query.get('limit', [DEFAULT_AVAILABLE_LIMIT])[0]), 1), MAX_AVAILABLE_LIMIT)
+            except ValueError:
+                send_json(self, {"error": "limit은 숫자여야 합니다."}, 400)
+                return
+
+            try:
+                # 학년 근접도 + 같은 학교 + 반 평균과 비슷한 성취도로 DB에서 점수화하고 상위 limit명만 받음
+                # (미배정 학생이 늘어도 전송량은 limit명 / 정의: supabase/migrations/20261018001500_rank_available_students.sql)
+                data_to_return = supabase.rpc('rank_available_students', {
+                    'p_class_id': class_id,
+                    'p_target_grade': target_grade,
+                    'p_limit': limit,
+                    'p_query': name_query
+                }).execute().data or []
+            except Exception as e:
+                print(f"rank_available_students RPC Error: {str(e)}")
+                send_json(self, {"error": str(e)}, 500)
+                return
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data_to_return).encode('utf-8'))
+        send_json(self, data_to_return)
 
+    @timed
     def do_POST(self):
+        supabase = get_client()
         # 학생 반 배정 (업데이트)
+        # - 배정(기본): { student_ids, class_id } → 목록의 학생을 이 반에 추가
+        # - 동기화: { mode: 'sync', class_id, student_ids, allow_move } → 반 명단을 목록과 똑같이 맞춤
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
         body = json.loads(post_data.decode('utf-8'))
         
         student_ids = body.get('student_ids', [])
         class_id = body.get('class_id')
-        
-        if student_ids and class_id:
-            supabase.table('students')\
+
+        if not class_id or not isinstance(student_ids, list):
+            send_json(self, {"error": "class_id와 student_ids(배열)가 필요합니다."}, 400)
+            return
+
+        try:
+            if body.get('mode') == 'sync':
+                # 현재 명단과의 차이만 한 트랜잭션에서 적용 (추가/제외 각각 update 한 번)
+                # (정의: supabase/migrations/20261018001100_sync_class_roster.sql)
+                result = supabase.rpc('sync_class_roster', {
+                    'p_class_id': class_id,
+                    'p_student_ids': student_ids,
+                    'p_allow_move': bool(body.get('allow_move'))
+                }).execute().data or {}
+                invalidate('classes', 'dashboard')
+                send_json(self, {
+                    "success": not result.get('conflicts') and not result.get('missing'),
+                    **result
+                })
+                return
+
+            if not student_ids:
+                send_json(self, {"success": False, "updated": [], "missing": []})
+                return
+
+            # 반영된 학생 id를 돌려받아서 보고 (DB에 없는 id는 missing)
+            res = supabase.table('students')\
                 .update({'class_id': class_id})\
                 .in_('id', student_ids)\
                 .execute()
-        
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({"success": True}).encode('utf-8'))
\ No newline at end of file
+            updated = [row['id'] for row in res.data]
+            invalidate('classes', 'dashboard')
+            updated_keys = {str(sid) for sid in updated}
+            missing = [sid for sid in student_ids if str(sid) not in updated_keys]
+
+            send_json(self, {"success": bool(updated), "updated": updated, "missing": missing})
+
+        except Exception as e:
+            print(f"Student Assign Error: {str(e)}")
+            send_json(self, {"error": str(e)}, 500)
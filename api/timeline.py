@@ -0,0 +1,62 @@
+from http.server import BaseHTTPRequestHandler
+from datetime import date
+from urllib.parse import urlparse, parse_qs
+from api._lib.db import get_client
+from api._lib.cache import TTLCache
+from api._lib.respond import send_json
+from api._lib.timing import timed
+
+# 학생별 성취도 추이 (주/월 단위 집계)
+# GET /api/timeline?student_id=1&bucket=week|month&from=2026-03-01&to=2026-07-31
+# 기록 원본 대신 구간별 건수/평균/최저/최고/단원 수만 내려주므로 한 학기치도 수 KB입니다.
+# (정의: supabase/migrations/20261018001400_student_timeline.sql)
+
+BUCKETS = ('week', 'month')
+
+# 학부모 화면과 같은 이유로 짧게 캐시 (새 평가는 최대 TIMELINE_TTL초 뒤에 반영)
+TIMELINE_TTL = 60
+_timeline_cache = TTLCache(ttl=TIMELINE_TTL, maxsize=512)
+
+
+def _parse_date(value):
+    # 'YYYY-MM-DD' → date, 비어 있으면 None (형식이 틀리면 ValueError)
+    return date.fromisoformat(value) if value else None
+
+
+class handler(BaseHTTPRequestHandler):
+    @timed
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        student_id = query.get('student_id', [None])[0]
+        bucket = query.get('bucket', ['week'])[0]
+
+        if not student_id:
+            send_json(self, {"error": "student_id가 필요합니다."}, 400)
+            return
+        if bucket not in BUCKETS:
+            send_json(self, {"error": "bucket은 week 또는 month 입니다."}, 400)
+            return
+        try:
+            date_from = _parse_date(query.get('from', [None])[0])
+            date_to = _parse_date(query.get('to', [None])[0])
+        except ValueError:
+            send_json(self, {"error": "from/to는 YYYY-MM-DD 형식이어야 합니다."}, 400)
+            return
+
+        key = (student_id, bucket, date_from, date_to)
+        timeline = _timeline_cache.get(key)
+        if timeline is None:
+            try:
+                timeline = get_client().rpc('student_timeline', {
+                    'p_student_id': student_id,
+                    'p_bucket': bucket,
+                    'p_from': date_from.isoformat() if date_from else None,
+                    'p_to': date_to.isoformat() if date_to else None
+                }).execute().data
+            except Exception as e:
+                print(f"Timeline Error: {str(e)}")
+                send_json(self, {"error": str(e)}, 500)
+                return
+            _timeline_cache.set(key, timeline)
+
+        send_json(self, {"student_id": student_id, **timeline})
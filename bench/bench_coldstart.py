@@ -0,0 +1,97 @@
+# 콜드 스타트 / warm 요청 지연 측정
+#
+# 사용법 (저장소 루트에서):
+#   python -m bench.bench_coldstart --module evaluate --path "/api/evaluate?student_id=1" --procs 10 --warm 50
+#
+# 새 프로세스를 --procs 번 띄워서 각각
+#   1) 핸들러 모듈 import 시간
+#   2) 첫 요청 시간 (클라이언트 생성 + 첫 TCP 연결 포함)
+#   3) 이어지는 warm 요청 --warm 번의 시간
+# 을 잰 뒤 p50/p95로 정리합니다. DB는 bench/stub_postgrest.py 스텁(고정 지연)을 사용합니다.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def child(module, path, warm):
+    # 서브프로세스 내부: 지연 없는 스텁 서버를 띄우고 핸들러를 실제 http.server에 올려 측정
+    from http.server import ThreadingHTTPServer
+    import threading
+    import urllib.error
+    import urllib.request
+
+    from bench.stub_postgrest import STUB_KEY, start_stub_server
+
+    stub, stub_url = start_stub_server(delay_ms=0)
+    os.environ['VITE_SUPABASE_URL'] = stub_url
+    os.environ['VITE_SUPABASE_ANON_KEY'] = STUB_KEY
+
+    start = time.perf_counter()
+    mod = __import__(f'api.{module}', fromlist=['handler'])
+    import_ms = (time.perf_counter() - start) * 1000
+
+    # 헤더/본문을 나눠 쓰는 핸들러에서 생기는 delayed ACK 지연을 측정에서 제외
+    handler_cls = type('handler', (mod.handler,), {'disable_nagle_algorithm': True})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_cls)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    target = f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+    def request_ms():
+        # 4xx/5xx도 응답을 끝까지 받은 요청이므로 그대로 시간을 잼
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(target) as res:
+                res.read()
+        except urllib.error.HTTPError as e:
+            e.read()
+        return (time.perf_counter() - start) * 1000
+
+    first_ms = request_ms()
+    warm_ms = [request_ms() for _ in range(warm)]
+
+    server.shutdown()
+    stub.shutdown()
+    print(json.dumps({'import': import_ms, 'first': first_ms, 'warm': warm_ms}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='evaluate')
+    parser.add_argument('--path', default='/api/evaluate?student_id=1')
+    parser.add_argument('--procs', type=int, default=10)
+    parser.add_argument('--warm', type=int, default=50)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.module, args.path, args.warm)
+        return
+
+    imports, firsts, warms = [], [], []
+    for _ in range(args.procs):
+        out = subprocess.run(
+            [sys.executable, '-m', 'bench.bench_coldstart', '--child',
+             '--module', args.module, '--path', args.path, '--warm', str(args.warm)],
+            capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(result['import'])
+        firsts.append(result['first'])
+        warms.extend(result['warm'])
+
+    print(f"api/{args.module}.py  (프로세스 {args.procs}개, warm 요청 {len(warms)}건)")
+    for label, samples in (('import', imports), ('첫 요청', firsts), ('warm 요청', warms)):
+        print(f"  {label:8s} p50 {percentile(samples, 50):7.1f}ms   p95 {percentile(samples, 95):7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# evaluate.py GET의 세 조회를 순차 실행 vs gather() 병렬 실행으로 비교하는 벤치마크
+#
+# 사용법 (저장소 루트에서):
+#   python -m bench.bench_parallel --delay 80 --runs 20
+#
+# 기대 결과: 순차 ≈ 3 × delay, 병렬 ≈ 1 × delay (+ 약간의 오버헤드)
+import argparse
+import statistics
+import time
+
+from bench.stub_postgrest import STUB_KEY, start_stub_server
+
+
+def measure(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--delay', type=int, default=50, help='스텁 서버의 쿼리당 지연 (ms)')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    from supabase import create_client
+    from api._lib.query import gather
+
+    server, base_url = start_stub_server(args.delay)
+    supabase = create_client(base_url, STUB_KEY)
+    student_id = 1
+
+    def queries():
+        return (
+            supabase.table('students').select('*').eq('id', student_id).limit(1),  # evaluate.py와 같이 limit(1)
+            supabase.table('curriculum').select('*').order('id'),
+            supabase.table('daily_logs').select('*').eq('student_id', student_id).order('created_at', desc=True).limit(1),
+        )
+
+    def sequential():
+        return [q.execute() for q in queries()]
+
+    def parallel():
+        return gather(*queries())
+
+    # 커넥션 풀 워밍업 (첫 TCP 연결 비용 제외)
+    sequential()
+    parallel()
+
+    seq_p50, seq_max = measure(sequential, args.runs)
+    par_p50, par_max = measure(parallel, args.runs)
+    server.shutdown()
+
+    print(f"쿼리당 지연: {args.delay}ms, 반복: {args.runs}회")
+    print(f"순차 실행: p50 {seq_p50:.1f}ms / max {seq_max:.1f}ms")
+    print(f"병렬 실행: p50 {par_p50:.1f}ms / max {par_max:.1f}ms")
+    print(f"단축 비율: {seq_p50 / par_p50:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# 추천 엔진 벤치마크: 학생 1만 명(가상 데이터)에 대해
+#   - decide() 를 학생마다 호출하는 루프
+#   - decide_batch() 일괄 계산 (다음 단원 표를 한 번만 만들어 재사용)
+# 의 시간을 비교하고, 두 결과가 학생별로 완전히 같은지 확인합니다. (Supabase 호출 없음)
+#
+# 사용법 (저장소 루트에서):
+#   python -m bench.bench_recommend_engine --students 10000 --units 120 --repeat 5
+import argparse
+import random
+import statistics
+import time
+
+from api._lib.recommend_engine import ACTIONS, decide, decide_batch
+
+
+def make_dataset(n_students, n_units, seed):
+    rng = random.Random(seed)
+    curriculum = [{'id': i * 10, 'title': f'단원 {i}'} for i in range(1, n_units + 1)]
+    last_logs = []
+    for _ in range(n_students):
+        roll = rng.random()
+        if roll < 0.05:
+            last_logs.append(None)  # 첫 수업
+        elif roll < 0.08:
+            last_logs.append({'score': rng.randint(0, 100), 'selected_units': []})
+        else:
+            # 가끔 커리큘럼에 없는 단원 id도 섞음 (삭제된 단원 등)
+            units = rng.sample([u['id'] for u in curriculum], k=rng.randint(1, 3))
+            if rng.random() < 0.02:
+                units.append(99999)
+            last_logs.append({'score': rng.randint(0, 100), 'selected_units': units})
+    return curriculum, last_logs
+
+
+def to_arrays(last_logs):
+    has_log = [log is not None for log in last_logs]
+    scores = [(log.get('score') or 0) if log else 0 for log in last_logs]
+    last_max_ids = [max(log['selected_units']) if log and log['selected_units'] else 0 for log in last_logs]
+    return has_log, scores, last_max_ids
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--units', type=int, default=120)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    curriculum, last_logs = make_dataset(args.students, args.units, args.seed)
+    curriculum_index = {item['id']: i for i, item in enumerate(curriculum)}
+    curriculum_ids = [item['id'] for item in curriculum]
+
+    scalar, scalar_ms = timed(
+        lambda: [decide(log, curriculum, curriculum_index) for log in last_logs], args.repeat
+    )
+    arrays, convert_ms = timed(lambda: to_arrays(last_logs), args.repeat)
+    (actions, unit_ids), batch_ms = timed(
+        lambda: decide_batch(*arrays, curriculum_ids), args.repeat
+    )
+
+    mismatches = sum(
+        1 for d, a, u in zip(scalar, actions, unit_ids)
+        if d['action'] != ACTIONS[a] or d['unit_ids'] != [int(u)] * len(d['unit_ids']) or (not d['unit_ids'] and u != -1)
+    )
+
+    print(f"학생 {args.students}명, 커리큘럼 {args.units}단원 (반복 {args.repeat}회 중앙값)")
+    print(f"  decide() 루프       {scalar_ms:8.2f}ms")
+    print(f"  배열 변환           {convert_ms:8.2f}ms")
+    print(f"  decide_batch()      {batch_ms:8.2f}ms")
+    print(f"  결과 불일치         {mismatches}건")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,816 @@
+# 로컬 하네스용 메모리 기반 Supabase 대역 (supabase-py 쿼리 빌더의 필요한 부분만 흉내)
+#
+# - table().select/insert/update/upsert/delete + eq/neq/gt/gte/lt/lte/in_/is_/like/ilike/or_/order/limit/single
+# - select 문자열의 조인(embed): 'student_id, students(name, grade)', 'students!inner(class_id)'
+# - 뷰/트리거로 만들어지는 값(latest_daily_logs, student_stats, *_digits 생성 컬럼)은 조회 시점에 계산
+# - rpc(): supabase/migrations 의 SQL 함수를 Python으로 옮긴 구현 (RPCS)
+#
+# 실제 PostgREST와 100% 같지는 않습니다. 핸들러의 조회 패턴/응답 형태를 DB 없이 재현하고
+# 성능 기준선을 재는 용도입니다. (latency_ms로 쿼리당 왕복 지연도 흉내 낼 수 있음)
+from datetime import datetime, timedelta, timezone, date
+import copy
+import difflib
+import re
+import threading
+import time
+
+from api._lib.phone import normalize_phone
+from api._lib.schedule import schedule_fields
+
+
+class FakeAPIError(Exception):
+    pass
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _coerce(row_value, value):
+    # PostgREST는 쿼리스트링 값을 컬럼 타입으로 캐스팅하므로 비슷하게 맞춤
+    if isinstance(value, str) and len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    if isinstance(row_value, bool) or row_value is None:
+        return value
+    if isinstance(row_value, int) and not isinstance(value, int):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+    if isinstance(row_value, float) and not isinstance(value, float):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+    if isinstance(row_value, str) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _like_regex(pattern, case_insensitive):
+    parts = []
+    for ch in pattern:
+        if ch in '%*':
+            parts.append('.*')
+        elif ch == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(ch))
+    return re.compile('^' + ''.join(parts) + '$', re.DOTALL | (re.IGNORECASE if case_insensitive else 0))
+
+
+def _compare(op, row_value, value):
+    if op == 'is':
+        if str(value).lower() == 'null':
+            return row_value is None
+        return row_value is (str(value).lower() == 'true')
+    if op == 'in':
+        if isinstance(value, str):
+            value = [v.strip() for v in value.strip('()').split(',') if v.strip()]
+        return any(row_value == _coerce(row_value, v) for v in value)
+    if op in ('like', 'ilike'):
+        if row_value is None:
+            return False
+        return bool(_like_regex(str(_coerce('', value)), op == 'ilike').match(str(row_value)))
+    if op == 'cs':
+        return row_value is not None and all(v in row_value for v in value)
+    if row_value is None:
+        return False
+    value = _coerce(row_value, value)
+    try:
+        if op == 'eq':
+            return row_value == value
+        if op == 'neq':
+            return row_value != value
+        if op == 'gt':
+            return row_value > value
+        if op == 'gte':
+            return row_value >= value
+        if op == 'lt':
+            return row_value < value
+        if op == 'lte':
+            return row_value <= value
+    except TypeError:
+        return False
+    raise FakeAPIError(f"지원하지 않는 연산자: {op}")
+
+
+def _split_top_level(text):
+    # 괄호/따옴표 밖의 쉼표로 분리
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\' and quoted and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+        i += 1
+    if current:
+        parts.append(''.join(current).strip())
+    return [p for p in parts if p]
+
+
+def _parse_logic(expr):
+    # 'name.gt."X",and(name.eq."X",id.gt.3)' → ('or', [...]) 트리
+    terms = []
+    for term in _split_top_level(expr):
+        for logic in ('and', 'or'):
+            if term.startswith(logic + '(') and term.endswith(')'):
+                terms.append((logic, _parse_logic(term[len(logic) + 1:-1])))
+                break
+        else:
+            column, op, value = term.split('.', 2)
+            terms.append(('cond', (column, op, value)))
+    return terms
+
+
+def _eval_logic(row, logic, terms):
+    results = []
+    for kind, payload in terms:
+        if kind == 'cond':
+            column, op, value = payload
+            results.append(_compare(op, row.get(column), value))
+        else:
+            results.append(_eval_logic(row, kind, payload))
+    return all(results) if logic == 'and' else any(results)
+
+
+# (테이블, 조인 이름) → (관계 종류, 내 컬럼, 상대 컬럼)
+# 'one'은 객체 하나(또는 None), 'many'는 배열로 붙음
+RELATIONS = {
+    ('daily_logs', 'students'): ('one', 'student_id', 'id'),
+    ('latest_daily_logs', 'students'): ('one', 'student_id', 'id'),
+    ('students', 'classes'): ('one', 'class_id', 'id'),
+    ('students', 'student_stats'): ('one', 'id', 'student_id'),
+    ('students', 'recommendations'): ('one', 'id', 'student_id'),
+    ('students', 'daily_logs'): ('many', 'id', 'student_id'),
+    ('classes', 'students'): ('many', 'id', 'class_id'),
+}
+
+
+def _parse_select(columns):
+    # '*, classes(name, schedule), students!inner(class_id)' → (컬럼 목록, [(조인 이름, inner 여부, 하위 select)])
+    plain, embeds = [], []
+    for item in _split_top_level(columns or '*'):
+        match = re.match(r'^(\w+)(!inner)?\((.*)\)$', item, re.DOTALL)
+        if match:
+            embeds.append((match.group(1), bool(match.group(2)), match.group(3)))
+        else:
+            plain.append(item.strip())
+    return plain, embeds
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.action = 'select'
+        self.columns = '*'
+        self.count_mode = None
+        self.filters = []       # (column, op, value) 또는 ('__logic__', 'or', terms)
+        self.orders = []
+        self.limit_n = None
+        self.single_mode = False
+        self.payload = None
+        self.on_conflict = None
+        self.default_to_null = True
+
+    # --- 동작 ---
+    def select(self, columns='*', count=None):
+        self.columns = columns
+        self.count_mode = count
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.action, self.payload = 'insert', payload
+        return self
+
+    def upsert(self, payload, on_conflict='', default_to_null=True, **kwargs):
+        self.action, self.payload = 'upsert', payload
+        self.on_conflict = [c.strip() for c in on_conflict.split(',') if c.strip()] or ['id']
+        self.default_to_null = default_to_null
+        return self
+
+    def update(self, payload, **kwargs):
+        self.action, self.payload = 'update', payload
+        return self
+
+    def delete(self, **kwargs):
+        self.action = 'delete'
+        return self
+
+    # --- 필터 ---
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def like(self, column, value):
+        return self._filter(column, 'like', value)
+
+    def ilike(self, column, value):
+        return self._filter(column, 'ilike', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def contains(self, column, values):
+        return self._filter(column, 'cs', list(values))
+
+    def or_(self, expr, reference_table=None):
+        self.filters.append(('__logic__', 'or', _parse_logic(expr)))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n, **kwargs):
+        self.limit_n = n
+        return self
+
+    def single(self):
+        self.single_mode = True
+        return self
+
+    def maybe_single(self):
+        self.single_mode = 'maybe'
+        return self
+
+    # --- 실행 ---
+    def _matches(self, row, joined=False):
+        # joined=False: 이 테이블 컬럼 필터만 / joined=True: 조인된 테이블 컬럼('students.class_id') 필터만
+        for f in self.filters:
+            if f[0] == '__logic__':
+                if not joined and not _eval_logic(row, f[1], f[2]):
+                    return False
+                continue
+            column, op, value = f
+            if ('.' in column) != joined:
+                continue
+            if joined:
+                # !inner 조인처럼 동작 (조인 결과가 조건에 안 맞으면 행 제외)
+                rel, sub = column.split('.', 1)
+                embedded = row.get(rel)
+                if isinstance(embedded, list):
+                    if not any(_compare(op, e.get(sub), value) for e in embedded):
+                        return False
+                elif embedded is None or not _compare(op, embedded.get(sub), value):
+                    return False
+            elif not _compare(op, row.get(column), value):
+                return False
+        return True
+
+    def _project(self, row, columns, table, lookups):
+        plain, embeds = _parse_select(columns)
+        if '*' in plain:
+            out = dict(row)
+        else:
+            out = {c: row.get(c) for c in plain}
+        for rel, inner, sub_columns in embeds:
+            kind, local, remote = RELATIONS[(table, rel)]
+            if (rel, remote) not in lookups:
+                index = {}
+                for r in self.db.rows(rel):
+                    index.setdefault(r.get(remote), []).append(r)
+                lookups[(rel, remote)] = index
+            related = lookups[(rel, remote)].get(row.get(local), [])
+            projected = [self._project(r, sub_columns, rel, lookups) for r in related]
+            if kind == 'one':
+                out[rel] = projected[0] if projected else None
+            else:
+                out[rel] = projected
+            if inner and not projected:
+                return None
+        return out
+
+    def _sorted(self, rows):
+        for column, desc in reversed(self.orders):
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=desc)
+            # PostgREST 기본: 오름차순은 NULL 마지막, 내림차순은 NULL 처음
+            rows = missing + present if desc else present + missing
+        return rows
+
+    def execute(self):
+        self.db.simulate_latency()
+        with self.db.lock:
+            if self.action == 'insert':
+                return Response(self.db.insert(self.table, self.payload))
+            if self.action == 'upsert':
+                return Response(self.db.upsert(self.table, self.payload, self.on_conflict))
+
+            # select / update / delete: 이 테이블 컬럼으로 먼저 거르고, 남은 행만 조인
+            source = [row for row in self.db.rows(self.table) if self._matches(row)]
+            if self.action == 'select':
+                projected, lookups = [], {}
+                for row in source:
+                    out = self._project(row, self.columns, self.table, lookups)
+                    if out is not None and self._matches(out, joined=True):
+                        projected.append(out)
+                rows = self._sorted(projected)
+                count = len(rows) if self.count_mode else None
+                if self.limit_n is not None:
+                    rows = rows[:self.limit_n]
+                rows = copy.deepcopy(rows)
+                if self.single_mode:
+                    if len(rows) != 1:
+                        if self.single_mode == 'maybe' and not rows:
+                            return Response(None)
+                        raise FakeAPIError(f"single(): {len(rows)}건이 조회되었습니다.")
+                    return Response(rows[0], count)
+                return Response(rows, count)
+
+            if self.action == 'update':
+                return Response(self.db.update(self.table, source, self.payload))
+            if self.action == 'delete':
+                return Response(self.db.delete(self.table, source))
+        raise FakeAPIError(f"지원하지 않는 동작: {self.action}")
+
+
+class FakeRPC:
+    def __init__(self, db, name, params):
+        self.db, self.name, self.params = db, name, params or {}
+
+    def execute(self):
+        self.db.simulate_latency()
+        fn = RPCS.get(self.name)
+        if fn is None:
+            raise FakeAPIError(f"Could not find the function {self.name}")
+        with self.db.lock:
+            return Response(copy.deepcopy(fn(self.db, **self.params)))
+
+
+class FakeSupabase:
+    """get_client() 대신 api._lib.db.set_client()로 주입해서 사용"""
+
+    def __init__(self, latency_ms=0):
+        self.latency_ms = latency_ms
+        self.lock = threading.RLock()
+        self.tables = {}
+        self._next_id = {}
+        self._writes = 0
+        self._stats_updated = {}  # student_id -> student_stats.updated_at (기록 쓰기 트리거)
+        self._view_cache = {}
+        # 조회 시점에 계산되는 뷰 (쓰기가 있을 때까지 결과를 재사용) (DB에서는 뷰/트리거로 유지됨)
+        self.views = {
+            'latest_daily_logs': _view_latest_daily_logs,
+            'student_stats': _view_student_stats,
+        }
+
+    # supabase-py 인터페이스
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name, params=None):
+        return FakeRPC(self, name, params)
+
+    # 내부 구현
+    def simulate_latency(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def rows(self, table):
+        if table in self.views:
+            cached = self._view_cache.get(table)
+            if cached is None or cached[0] != self._writes:
+                cached = self._view_cache[table] = (self._writes, self.views[table](self))
+            return cached[1]
+        return [_with_generated(table, row) for row in self.tables.setdefault(table, [])]
+
+    def _prepare_insert(self, table, row):
+        row = dict(row)
+        if 'id' not in row and table not in ('user_roles',):
+            self._next_id[table] = self._next_id.get(table, 0) + 1
+            row['id'] = self._next_id[table]
+        elif isinstance(row.get('id'), int):
+            self._next_id[table] = max(self._next_id.get(table, 0), row['id'])
+        row.setdefault('created_at', _now_iso())
+        if table == 'daily_logs':
+            row.setdefault('log_date', date.today().isoformat())
+        return row
+
+    def insert(self, table, payload):
+        rows = payload if isinstance(payload, list) else [payload]
+        inserted = [self._prepare_insert(table, r) for r in rows]
+        self.tables.setdefault(table, []).extend(inserted)
+        self._after_write(table, inserted)
+        return copy.deepcopy([_with_generated(table, r) for r in inserted])
+
+    def upsert(self, table, payload, conflict_columns):
+        rows = payload if isinstance(payload, list) else [payload]
+        existing = self.tables.setdefault(table, [])
+        # on_conflict 컬럼의 유니크 인덱스
+        index = {tuple(str(r.get(c)) for c in conflict_columns): r for r in existing}
+        saved = []
+        for row in rows:
+            key = tuple(str(row.get(c)) for c in conflict_columns)
+            match = index.get(key)
+            if match is not None:
+                match.update(row)
+                saved.append(match)
+            else:
+                new_row = index[key] = self._prepare_insert(table, row)
+                existing.append(new_row)
+                saved.append(new_row)
+        self._after_write(table, saved)
+        return copy.deepcopy([_with_generated(table, r) for r in saved])
+
+    def update(self, table, targets, payload):
+        target_ids = {t.get('id') for t in targets}
+        updated = []
+        for row in self.tables.get(table, []):
+            if row.get('id') in target_ids:
+                row.update(payload)
+                updated.append(row)
+        self._after_write(table, updated)
+        return copy.deepcopy([_with_generated(table, r) for r in updated])
+
+    def delete(self, table, targets):
+        target_ids = {t.get('id') for t in targets}
+        kept, deleted = [], []
+        for row in self.tables.get(table, []):
+            (deleted if row.get('id') in target_ids else kept).append(row)
+        self.tables[table] = kept
+        self._after_write(table, deleted)
+        return copy.deepcopy(deleted)
+
+    def _after_write(self, table, rows=()):
+        # DB 트리거 흉내
+        self._writes += 1
+        if table == 'daily_logs':
+            touched = {r.get('student_id') for r in rows}
+            stamp = _now_iso()
+            for sid in touched:
+                self._stats_updated[sid] = stamp
+            self.tables['recommendations'] = [
+                r for r in self.tables.get('recommendations', []) if r['student_id'] not in touched
+            ]
+        if table == 'curriculum':
+            self.tables['recommendations'] = []
+            for row in self.tables.setdefault('cache_versions', []):
+                if row.get('name') == 'curriculum':
+                    row['version'] = row.get('version', 0) + 1
+
+
+# --- 생성 컬럼 / 뷰 ---
+
+def _grade_level(grade):
+    base = {'초': 0, '중': 6, '고': 9}.get((grade or '')[:1])
+    digits = re.search(r'\d+', grade or '')
+    return base + int(digits.group()) if base is not None and digits else None
+
+
+def _with_generated(table, row):
+    if table == 'classes':
+        # classes_schedule_fields 트리거 (schedule → schedule_days/schedule_slots)
+        return {**row, **schedule_fields(row.get('schedule') or '')}
+    if table != 'students':
+        return row
+    out = dict(row)
+    out['phone_digits'] = normalize_phone(row.get('phone_number'))
+    out['parent_phone_1_digits'] = normalize_phone(row.get('parent_phone_1'))
+    out['parent_phone_2_digits'] = normalize_phone(row.get('parent_phone_2'))
+    out['grade_level'] = _grade_level(row.get('grade'))
+    return out
+
+
+def _logs_by_student(db):
+    grouped = {}
+    for log in db.tables.get('daily_logs', []):
+        grouped.setdefault(log['student_id'], []).append(log)
+    for logs in grouped.values():
+        logs.sort(key=lambda l: l['created_at'], reverse=True)
+    return grouped
+
+
+def _view_latest_daily_logs(db):
+    students = {s['id']: s for s in db.tables.get('students', [])}
+    out = []
+    for sid, logs in _logs_by_student(db).items():
+        if sid in students:
+            out.append({**logs[0], 'class_id': students[sid].get('class_id')})
+    return out
+
+
+def _view_student_stats(db):
+    out = []
+    for sid, logs in _logs_by_student(db).items():
+        scores = [l.get('score') for l in logs]
+        recent = scores[:30]
+        recent_present = [s for s in recent if s is not None]
+        present = [s for s in scores if s is not None]
+        out.append({
+            'student_id': sid,
+            'log_count': len(logs),
+            'score_count': len(present),
+            'score_sum': sum(present),
+            'last_score': logs[0].get('score'),
+            'last_units': logs[0].get('selected_units'),
+            'last_log_at': logs[0]['created_at'],
+            'recent_scores': recent,
+            'recent_avg': sum(recent_present) / len(recent_present) if recent_present else None,
+            'updated_at': db._stats_updated.get(sid, logs[0]['created_at']),
+        })
+    return out
+
+
+# --- RPC (supabase/migrations/*.sql 의 Python 버전) ---
+
+def _rpc_dashboard_summary(db, p_today, p_dow):
+    stats = {s['student_id']: s for s in db.rows('student_stats')}
+    students = {s['id']: s for s in db.tables.get('students', [])}
+    risk = []
+    for r in db.tables.get('student_risk', []):
+        sid = r['student_id']
+        if r['flagged'] and sid in students:
+            risk.append(((stats.get(sid) or {}).get('last_log_at') or '', {
+                'name': students[sid].get('name'),
+                'grade': students[sid].get('grade'),
+                'avg': r.get('recent_avg'),
+                'reasons': r.get('reasons') or [],
+            }))
+    risk.sort(key=lambda r: r[0], reverse=True)
+    return {
+        'today_classes': sum(1 for c in db.tables.get('classes', []) if int(p_dow) in (c.get('schedule_days') or [])),
+        'total_students': len(students),
+        'today_evals': sum(1 for l in db.tables.get('daily_logs', []) if l['created_at'] >= f"{p_today}T00:00:00"),
+        'risk_students': [r[1] for r in risk],
+    }
+
+
+def _rpc_class_students_with_status(db, p_class_id, p_since):
+    done = {l['student_id'] for l in db.tables.get('daily_logs', []) if l['created_at'] >= p_since}
+    students = [s for s in db.rows('students') if str(s.get('class_id')) == str(p_class_id)]
+    students.sort(key=lambda s: s.get('name') or '')
+    return [{**s, 'isCompleted': s['id'] in done} for s in students]
+
+
+def _rpc_search_students(db, p_query, p_limit=20):
+    q = (p_query or '').strip()
+    if not q:
+        return []
+    digits = normalize_phone(q)
+    ranked = []
+    for s in db.rows('students'):
+        name = s.get('name') or ''
+        phone_hit = len(digits) >= 3 and (digits in s['phone_digits'] or digits in s['parent_phone_1_digits'])
+        similarity = difflib.SequenceMatcher(None, name, q).ratio()
+        if not (q.lower() in name.lower() or similarity >= 0.3 or phone_hit):
+            continue
+        rank = (3 if name == q else 2 if name.lower().startswith(q.lower()) else 0) + similarity + (1.5 if phone_hit else 0)
+        ranked.append({**s, 'rank': round(rank, 3)})
+    ranked.sort(key=lambda r: (-r['rank'], r.get('name') or '', r['id']))
+    return ranked[:max(1, min(int(p_limit), 100))]
+
+
+def _rpc_parent_snapshot(db, p_parent_id):
+    classes = {c['id']: c for c in db.tables.get('classes', [])}
+    stats = {s['student_id']: s for s in _view_student_stats(db)}
+    logs = _logs_by_student(db)
+    children = sorted(
+        (s for s in db.rows('students') if str(s.get('parent_user_id')) == str(p_parent_id)),
+        key=lambda s: s['id']
+    )
+    out_children = []
+    for child in children:
+        cls = classes.get(child.get('class_id'))
+        st = stats.get(child['id'])
+        out_children.append({
+            **child,
+            'classes': {'name': cls.get('name'), 'schedule': cls.get('schedule')} if cls else None,
+            'student_stats': {'recent_avg': st['recent_avg'], 'recent_scores': st['recent_scores']} if st else None,
+        })
+    return {
+        'children': out_children,
+        'logs': {str(c['id']): logs.get(c['id'], [])[:30] for c in children},
+    }
+
+
+def _rpc_sync_class_roster(db, p_class_id, p_student_ids, p_allow_move=False):
+    class_id = int(p_class_id)
+    if not any(c['id'] == class_id for c in db.tables.get('classes', [])):
+        raise FakeAPIError(f"class {class_id} not found")
+    wanted = {int(x) for x in p_student_ids or []}
+    students = {s['id']: s for s in db.tables.get('students', [])}
+    added, removed, conflicts = [], [], []
+    for sid, s in sorted(students.items()):
+        if s.get('class_id') == class_id and sid not in wanted:
+            s['class_id'] = None
+            removed.append(sid)
+    for sid in sorted(wanted & students.keys()):
+        s = students[sid]
+        if s.get('class_id') == class_id:
+            continue
+        if s.get('class_id') is not None and not p_allow_move:
+            conflicts.append({'id': sid, 'class_id': s['class_id']})
+            continue
+        added.append({'id': sid, 'from_class_id': s.get('class_id')})
+        s['class_id'] = class_id
+    db._after_write('students')
+    return {'added': added, 'removed': removed, 'conflicts': conflicts,
+            'missing': sorted(wanted - students.keys())}
+
+
+def _rpc_recommendation_inputs(db, p_limit=1000):
+    stats = {s['student_id']: s for s in db.rows('student_stats')}
+    done = {r['student_id'] for r in db.tables.get('recommendations', [])}
+    out = []
+    for s in sorted(db.tables.get('students', []), key=lambda s: s['id']):
+        if s.get('class_id') is None or s['id'] in done:
+            continue
+        st = stats.get(s['id']) or {}
+        units = st.get('last_units') or []
+        out.append({
+            'student_id': s['id'],
+            'last_score': st.get('last_score'),
+            'last_max_unit': max(units) if units else None,
+            'last_log_at': st.get('last_log_at'),
+        })
+        if len(out) >= max(1, min(int(p_limit), 5000)):
+            break
+    return out
+
+
+def _rpc_store_recommendations(db, p_rows, p_curriculum_version):
+    version = next((r['version'] for r in db.tables.get('cache_versions', []) if r['name'] == 'curriculum'), None)
+    if p_curriculum_version != version:
+        return 0
+    last_log_at = {s['student_id']: s['last_log_at'] for s in db.rows('student_stats')}
+    rows = [dict(r) for r in p_rows if r.get('based_on_log_at') == last_log_at.get(r['student_id'])]
+    if rows:
+        db.upsert('recommendations', rows, ['student_id'])
+    return len(rows)
+
+
+def _rpc_rematch_parents(db):
+    parents = {}
+    for role in sorted(db.tables.get('user_roles', []), key=lambda r: str(r['id'])):
+        if role.get('role') == 'parent' and role.get('phone_digits'):
+            parents.setdefault(role['phone_digits'], role['id'])
+    matched = 0
+    for s in db.tables.get('students', []):
+        if s.get('parent_user_id') is not None:
+            continue
+        # parent_phone_1 쪽 계정 우선
+        for column in ('parent_phone_1', 'parent_phone_2'):
+            parent_id = parents.get(normalize_phone(s.get(column)))
+            if parent_id is not None:
+                s['parent_user_id'] = parent_id
+                matched += 1
+                break
+    if matched:
+        db._after_write('students')
+    return matched
+
+
+def _rpc_student_timeline(db, p_student_id, p_bucket='week', p_from=None, p_to=None):
+    bucket = 'month' if p_bucket == 'month' else 'week'
+    groups = {}
+    for log in db.tables.get('daily_logs', []):
+        if str(log['student_id']) != str(p_student_id):
+            continue
+        day = date.fromisoformat(log.get('log_date') or log['created_at'][:10])
+        if (p_from and day < date.fromisoformat(p_from)) or (p_to and day > date.fromisoformat(p_to)):
+            continue
+        start = day.replace(day=1) if bucket == 'month' else day - timedelta(days=day.weekday())
+        groups.setdefault(start, []).append(log)
+    out = {'bucket': bucket, 'starts': [], 'count': [], 'mean': [], 'min': [], 'max': [], 'units': [], 'max_unit': []}
+    for start in sorted(groups):
+        logs = groups[start]
+        scores = [l['score'] for l in logs if l.get('score') is not None]
+        units = {int(u) for l in logs for u in (l.get('selected_units') or [])}
+        out['starts'].append(start.isoformat())
+        out['count'].append(len(logs))
+        out['mean'].append(round(sum(scores) / len(scores), 1) if scores else None)
+        out['min'].append(min(scores) if scores else None)
+        out['max'].append(max(scores) if scores else None)
+        out['units'].append(len(units))
+        out['max_unit'].append(max(units) if units else None)
+    return out
+
+
+def _rpc_rank_available_students(db, p_class_id=None, p_target_grade=None, p_limit=100, p_query=None):
+    cls = next((c for c in db.tables.get('classes', []) if str(c['id']) == str(p_class_id)), None)
+    level = _grade_level(p_target_grade or (cls or {}).get('target_grade'))
+    stats = {s['student_id']: s for s in db.rows('student_stats')}
+    students = db.rows('students')
+    members = [s for s in students if p_class_id is not None and str(s.get('class_id')) == str(p_class_id)]
+    schools = {}
+    for m in members:
+        if m.get('school_name') is not None:
+            schools[m['school_name']] = schools.get(m['school_name'], 0) + 1 / len(members)
+    avgs = [stats[m['id']]['recent_avg'] for m in members if (stats.get(m['id']) or {}).get('recent_avg') is not None]
+    class_avg = sum(avgs) / len(avgs) if avgs else None
+    ranked = []
+    for s in students:
+        if s.get('class_id') is not None:
+            continue
+        if (p_query or '').strip() and p_query.strip().lower() not in (s.get('name') or '').lower():
+            continue
+        diff = abs(s['grade_level'] - level) if s['grade_level'] is not None and level is not None else None
+        score = {0: 3, 1: 1.5, 2: 0.5}.get(diff, 0) + schools.get(s.get('school_name'), 0)
+        recent = (stats.get(s['id']) or {}).get('recent_avg')
+        if recent is not None and class_avg is not None:
+            score += max(0, 1 - abs(recent - class_avg) / 50)
+        ranked.append({**s, 'match_score': round(score, 3)})
+    ranked.sort(key=lambda r: (-r['match_score'], r.get('grade') or '', r.get('name') or '', r['id']))
+    return ranked[:max(1, min(int(p_limit), 500))]
+
+
+def _rpc_risk_inputs(db, p_today, p_limit=1000):
+    stats = {s['student_id']: s for s in db.rows('student_stats')}
+    classes = {c['id']: c for c in db.rows('classes')}
+    done = {r['student_id']: r for r in db.tables.get('student_risk', [])}
+    out = []
+    for s in sorted(db.tables.get('students', []), key=lambda s: s['id']):
+        st = stats.get(s['id']) or {}
+        r = done.get(s['id'])
+        schedule_days = (classes.get(s.get('class_id')) or {}).get('schedule_days')
+        if r is not None and r['stats_updated_at'] == st.get('updated_at') and r['class_id'] == s.get('class_id') \
+                and r.get('schedule_days') == schedule_days and not (r['next_check_date'] and r['next_check_date'] <= p_today):
+            continue
+        out.append({
+            'student_id': s['id'],
+            'class_id': s.get('class_id'),
+            'schedule_days': schedule_days,
+            'recent_scores': st.get('recent_scores'),
+            'last_log_at': st.get('last_log_at'),
+            'stats_updated_at': st.get('updated_at'),
+        })
+        if len(out) >= max(1, min(int(p_limit), 5000)):
+            break
+    return out
+
+
+def _rpc_store_student_risk(db, p_rows):
+    stats = {s['student_id']: s for s in db.rows('student_stats')}
+    students = {s['id']: s for s in db.tables.get('students', [])}
+    classes = {c['id']: c for c in db.rows('classes')}
+    rows = [
+        dict(r) for r in p_rows
+        if r['student_id'] in students
+        and r.get('stats_updated_at') == (stats.get(r['student_id']) or {}).get('updated_at')
+        and r.get('class_id') == students[r['student_id']].get('class_id')
+        and r.get('schedule_days') == (classes.get(r.get('class_id')) or {}).get('schedule_days')
+    ]
+    if rows:
+        db.upsert('student_risk', rows, ['student_id'])
+    return len(rows)
+
+
+RPCS = {
+    'dashboard_summary': _rpc_dashboard_summary,
+    'class_students_with_status': _rpc_class_students_with_status,
+    'search_students': _rpc_search_students,
+    'parent_snapshot': _rpc_parent_snapshot,
+    'sync_class_roster': _rpc_sync_class_roster,
+    'recommendation_inputs': _rpc_recommendation_inputs,
+    'store_recommendations': _rpc_store_recommendations,
+    'rematch_parents': _rpc_rematch_parents,
+    'student_timeline': _rpc_student_timeline,
+    'rank_available_students': _rpc_rank_available_students,
+    'risk_inputs': _rpc_risk_inputs,
+    'store_student_risk': _rpc_store_student_risk,
+}
@@ -0,0 +1,284 @@
+# 로컬 하네스: 가짜 Supabase(bench/fake_supabase.py) 위에 api/*.py 핸들러를 실제 http.server로 띄웁니다.
+#
+# 사용법 (저장소 루트에서):
+#   python -m bench.harness                # 시드 데이터 + 모든 엔드포인트 스모크 테스트
+#   python -m bench.harness --serve        # 서버만 띄워 두고 포트 출력 (Ctrl+C로 종료)
+#   python -m bench.harness --asgi         # api/_lib/asgi.py 단일 앱(uvicorn)으로 같은 스모크 테스트
+#
+# 기본은 Vercel처럼 파일(모듈) 하나당 서버 하나를 띄우고, 경로 /api/<이름> 은 해당 서버로 보냅니다.
+# 운영 DB에는 전혀 접근하지 않습니다.
+import argparse
+import json
+import os
+import random
+import time
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
+from urllib.parse import quote
+
+from api._lib.asgi import discover_handlers
+from api._lib.curriculum import invalidate_curriculum
+from api._lib.db import set_client
+from api._lib.phone import normalize_phone
+from api._lib.schedule import DAY_NAMES, schedule_fields
+from bench.fake_supabase import FakeSupabase
+
+SCHOOL_TYPES = ('초', '중', '고')
+FAMILY_NAMES = '김이박최정강조윤장임'
+GIVEN_NAMES = ('민준', '서연', '도윤', '하은', '시우', '지우', '주원', '서윤', '예준', '지호', '수아', '하준')
+
+
+def seed(db, classes=12, students=300, units=40, logs_per_student=20, parents=50, rng_seed=42):
+    """반/학생/커리큘럼/평가 기록을 만들어 넣고, 스모크/부하 테스트에 쓸 id 목록을 돌려줍니다."""
+    rng = random.Random(rng_seed)
+    now = datetime.now(timezone.utc)
+
+    db.insert('cache_versions', {'name': 'curriculum', 'version': 1})
+    db.insert('curriculum', [{'title': f'{i + 1}단원'} for i in range(units)])
+
+    class_rows = []
+    for i in range(classes):
+        # 프론트(ClassList.tsx)가 만드는 형식: "월요일 오후 07:00 / 수요일 오후 07:00"
+        hour = f"{rng.randint(2, 9):02d}:00"
+        schedule = ' / '.join(f"{day} 오후 {hour}" for day in rng.sample(DAY_NAMES[:6], 2))
+        class_rows.append({
+            'name': f'{i + 1}반',
+            'target_grade': f"{rng.choice(SCHOOL_TYPES)}{rng.randint(1, 3)}",
+            'schedule': schedule,
+            **schedule_fields(schedule),
+        })
+    class_ids = [c['id'] for c in db.insert('classes', class_rows)]
+
+    parent_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(parents)]
+    student_rows = []
+    for i in range(students):
+        student_rows.append({
+            'name': rng.choice(FAMILY_NAMES) + rng.choice(GIVEN_NAMES),
+            'grade': f"{rng.choice(SCHOOL_TYPES)}{rng.randint(1, 3)}",
+            'school_name': f"{rng.choice(('한빛', '새솔', '푸른'))}학교",
+            'phone_number': f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            'parent_phone_1': f"010{rng.randint(10000000, 99999999)}",
+            'parent_phone_2': f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}" if i % 5 == 0 else None,
+            # 일부 학생은 미배정 (students?mode=available 용)
+            'class_id': rng.choice(class_ids) if rng.random() < 0.8 else None,
+            'parent_user_id': parent_ids[i % parents] if i < parents * 2 else None,
+        })
+    student_ids = [s['id'] for s in db.insert('students', student_rows)]
+
+    # 가입한 학부모 계정 (정규화 번호 저장) + 아직 연결 안 된 학생의 parent_phone_2로 가입한 계정 하나
+    # → register mode='rematch' / cron parents 가 연결할 대상
+    roles = [{'id': pid, 'role': 'parent', 'phone_digits': normalize_phone(student_rows[i]['parent_phone_1'])}
+             for i, pid in enumerate(parent_ids)]
+    unlinked = next((row for row in student_rows if row['parent_user_id'] is None and row['parent_phone_2']), None)
+    if unlinked:
+        roles.append({'id': str(uuid.UUID(int=rng.getrandbits(128))), 'role': 'parent',
+                      'phone_digits': normalize_phone(unlinked['parent_phone_2'])})
+    db.insert('user_roles', roles)
+
+    logs = []
+    for sid in student_ids:
+        unit = 1
+        for day in range(logs_per_student, 0, -1):
+            score = rng.randint(40, 100)
+            created = now - timedelta(days=day, minutes=rng.randint(0, 600))
+            logs.append({
+                'student_id': sid,
+                'score': score,
+                'selected_units': [unit],
+                'homework': 'done',
+                'attitude': 'good',
+                'teacher_comment': '',
+                'created_at': created.isoformat(),
+                'log_date': created.date().isoformat(),
+            })
+            if score >= 70 and unit < units:
+                unit += 1
+    db.insert('daily_logs', logs)
+
+    # register 매칭 확인용: 저장된 형식과 다르게 하이픈을 넣은 학부모 번호
+    digits = student_rows[-1]['parent_phone_1']
+    parent_phone = f"{digits[:3]}-{digits[3:7]}-{digits[7:]}"
+    return {'class_ids': class_ids, 'student_ids': student_ids, 'parent_ids': parent_ids, 'parent_phone': parent_phone}
+
+
+class _Server(ThreadingHTTPServer):
+    # 기본 backlog(5)로는 동시 요청이 몰릴 때 SYN이 버려져 1초 재전송 지연이 p99에 섞임
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class Harness:
+    def __init__(self, db=None, latency_ms=0, asgi=False):
+        self.db = db or FakeSupabase(latency_ms=latency_ms)
+        self.asgi = asgi
+        self.servers = {}
+        self.asgi_server = None
+        self.asgi_port = None
+
+    def start(self):
+        set_client(self.db)
+        invalidate_curriculum()
+        if self.asgi:
+            self._start_asgi()
+            return self
+        for name, handler in sorted(discover_handlers().items()):
+            # 헤더/본문을 나눠 쓰는 핸들러에서 생기는 delayed ACK 지연을 측정에서 제외
+            handler_cls = type('handler', (handler,), {
+                'disable_nagle_algorithm': True,
+                'log_message': lambda *args: None,
+            })
+            server = _Server(('127.0.0.1', 0), handler_cls)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers[name] = server
+        return self
+
+    def _start_asgi(self):
+        # ASGI 서버는 선택 의존성 (pip install uvicorn)
+        import socket
+        import uvicorn
+
+        from api._lib.asgi import app
+
+        # proto를 명시해야 asyncio가 연결 소켓에 TCP_NODELAY를 켬 (uvicorn --port 로 띄울 때와 동일)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.bind(('127.0.0.1', 0))
+        self.asgi_port = sock.getsockname()[1]
+        config = uvicorn.Config(app, log_level='warning', access_log=False, backlog=128)
+        self.asgi_server = uvicorn.Server(config)
+        threading.Thread(target=self.asgi_server.run, kwargs={'sockets': [sock]}, daemon=True).start()
+        while not self.asgi_server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        if self.asgi_server is not None:
+            self.asgi_server.should_exit = True
+            self.asgi_server = None
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        self.servers = {}
+        set_client(None)
+        invalidate_curriculum()
+
+    def url(self, path):
+        # '/api/evaluate?student_id=1' → 해당 모듈 서버의 URL
+        if self.asgi:
+            return f"http://127.0.0.1:{self.asgi_port}{quote(path, safe='/?=&%')}"
+        name = path.split('?', 1)[0].strip('/').split('/')[1]
+        return f"http://127.0.0.1:{self.servers[name].server_address[1]}{quote(path, safe='/?=&%')}"
+
+    def request(self, method, path, body=None, headers=None):
+        """(status, 응답 헤더, JSON 본문 또는 None) 반환"""
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = dict(headers or {})
+        # 관리용 호출(cron, 학부모 일괄 재매칭)은 CRON_SECRET 인증
+        if path.startswith('/api/cron') or (isinstance(body, dict) and body.get('mode') == 'rematch'):
+            headers.setdefault('Authorization', f"Bearer {os.environ.get('CRON_SECRET', '')}")
+        req = urllib.request.Request(self.url(path), data=data, method=method, headers=headers)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        try:
+            with urllib.request.urlopen(req) as res:
+                status, res_headers, raw = res.status, dict(res.headers), res.read()
+        except urllib.error.HTTPError as e:
+            status, res_headers, raw = e.code, dict(e.headers), e.read()
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = raw.decode('utf-8', 'replace')
+        return status, res_headers, payload
+
+
+def smoke_requests(ids):
+    """엔드포인트마다 대표 요청 (method, path, body)"""
+    student_id = ids['student_ids'][0]
+    class_id = ids['class_ids'][0]
+    today = datetime.now().date().isoformat()
+    return [
+        ('GET', '/api/cron?job=recommendations', None),
+        ('GET', '/api/cron?job=risk', None),
+        ('GET', '/api/classes', None),
+        ('POST', '/api/classes', {'name': '하네스반', 'target_grade': '중1', 'schedule': '월요일 오후 07:00 / 수요일 오후 07:00'}),
+        ('GET', '/api/dashboard', None),
+        ('GET', f'/api/evaluate?student_id={student_id}', None),
+        ('POST', '/api/evaluate', {'student_id': student_id, 'score': 85, 'selected_units': [3],
+                                   'homework': 'done', 'attitude': 'good', 'teacher_comment': '하네스'}),
+        ('POST', '/api/evaluate', {'evaluations': [
+            {'student_id': sid, 'score': 75, 'selected_units': [2], 'log_date': today} for sid in ids['student_ids'][1:6]
+        ]}),
+        ('GET', '/api/master_students?limit=20', None),
+        ('GET', '/api/master_students?q=김', None),
+        ('GET', '/api/master_students?q=김1', None),
+        ('GET', '/api/master_students?q=김,(1)', None),
+        ('POST', '/api/master_students', {'name': '하네스', 'school_type': '중', 'grade_num': '2',
+                                          'school_name': '한빛중', 'phone_number': '010-1234-5678'}),
+        ('GET', f"/api/parent?parent_id={ids['parent_ids'][0]}", None),
+        ('POST', '/api/recommend', {'student_id': student_id}),
+        ('POST', '/api/recommend', {'class_id': class_id}),
+        ('POST', '/api/register', {'user_id': str(uuid.uuid4()), 'role': 'parent', 'phone': ids['parent_phone']}),
+        ('POST', '/api/register', {'mode': 'rematch'}),
+        ('GET', '/api/cron?job=parents', None),
+        ('GET', '/api/search?q=김민', None),
+        ('GET', f'/api/timeline?student_id={student_id}', None),
+        ('GET', f'/api/timeline?student_id={student_id}&bucket=month&from=2026-01-01', None),
+        ('GET', f'/api/students?class_id={class_id}', None),
+        ('GET', '/api/students?mode=available&target_grade=중1', None),
+        ('GET', f'/api/students?mode=available&class_id={class_id}&limit=20', None),
+        ('GET', f'/api/students?mode=available&class_id={class_id}&q=김', None),
+        ('POST', '/api/students', {'student_ids': ids['student_ids'][-3:], 'class_id': class_id}),
+        ('POST', '/api/students', {'mode': 'sync', 'class_id': class_id,
+                                   'student_ids': ids['student_ids'][-3:] + [ids['student_ids'][0], 999999]}),
+    ]
+
+
+def run_smoke(harness, ids):
+    failures = 0
+    for method, path, body in smoke_requests(ids):
+        status, _, payload = harness.request(method, path, body)
+        ok = 200 <= status < 300 and not (isinstance(payload, dict) and payload.get('error'))
+        failures += not ok
+        summary = json.dumps(payload, ensure_ascii=False, default=str)
+        print(f"{'OK ' if ok else 'ERR'} {status} {method:4} {path[:60]:60} {summary[:90]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--serve', action='store_true', help='스모크 테스트 없이 서버만 띄움')
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--latency-ms', type=float, default=0, help='가짜 DB 쿼리당 왕복 지연')
+    parser.add_argument('--asgi', action='store_true', help='파일별 서버 대신 ASGI 단일 앱으로 서빙')
+    args = parser.parse_args()
+
+    # 시드를 먼저 넣어야 ASGI 시작 시 워밍업이 빈 커리큘럼을 캐시하지 않음
+    harness = Harness(latency_ms=args.latency_ms, asgi=args.asgi)
+    ids = seed(harness.db, students=args.students)
+    harness.start()
+
+    if args.serve:
+        if args.asgi:
+            print(f"ASGI http://127.0.0.1:{harness.asgi_port}/api/<이름>")
+        for name, server in sorted(harness.servers.items()):
+            print(f"/api/{name:16} http://127.0.0.1:{server.server_address[1]}/api/{name}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        harness.stop()
+        return
+
+    failures = run_smoke(harness, ids)
+    harness.stop()
+    print(f"\n실패 {failures}건")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('VITE_SUPABASE_URL', 'http://fake.invalid')
+    os.environ.setdefault('VITE_SUPABASE_ANON_KEY', 'fake')
+    os.environ.setdefault('CRON_SECRET', 'harness')
+    main()
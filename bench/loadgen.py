@@ -0,0 +1,163 @@
+# 엔드포인트별 부하 측정 (처리량 + p50/p95/p99)
+#
+# 사용법 (저장소 루트에서):
+#   python -m bench.loadgen                                # 모든 시나리오, 동시 8, 시나리오당 400회
+#   python -m bench.loadgen --latency-ms 5 --concurrency 16 --only evaluate,dashboard
+#   python -m bench.loadgen --json > baseline.json         # 결과를 JSON으로 저장해 두고 비교
+#   python -m bench.loadgen --asgi                         # 같은 시나리오를 ASGI 단일 앱(uvicorn)으로
+#
+# bench/harness.py 로 가짜 DB 위에 모든 핸들러를 띄우고 시나리오를 차례로 실행합니다.
+# --latency-ms 로 쿼리당 DB 왕복 지연을 주면 (실제 Supabase는 보통 수~수십 ms)
+# 요청당 쿼리 수/병렬화 차이가 수치로 드러납니다.
+# 부하 발생기와 서버가 한 프로세스(GIL 하나)에서 돌기 때문에 절대 처리량보다는
+# 같은 설정으로 잰 변경 전/후 비교에 쓰세요.
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bench.harness import Harness, seed
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def scenarios(ids):
+    """(이름, method, 요청 i → (path, body)) 목록. i로 학생/반을 돌려 가며 캐시 편향을 줄임"""
+    students = ids['student_ids']
+    classes = ids['class_ids']
+    parents = ids['parent_ids']
+    today = datetime.now().date().isoformat()
+
+    def evaluation(i):
+        return {'student_id': students[i % len(students)], 'score': 50 + i % 50, 'selected_units': [1 + i % 10],
+                'homework': 'done', 'attitude': 'good', 'teacher_comment': '', 'log_date': today}
+
+    return [
+        ('classes GET', 'GET', lambda i: ('/api/classes', None)),
+        ('dashboard GET', 'GET', lambda i: ('/api/dashboard', None)),
+        ('evaluate GET', 'GET', lambda i: (f'/api/evaluate?student_id={students[i % len(students)]}', None)),
+        ('evaluate POST', 'POST', lambda i: ('/api/evaluate', evaluation(i))),
+        ('evaluate POST bulk20', 'POST', lambda i: ('/api/evaluate', {'evaluations': [evaluation(i * 20 + k) for k in range(20)]})),
+        ('master_students GET', 'GET', lambda i: ('/api/master_students?limit=100', None)),
+        ('master_students GET q', 'GET', lambda i: ('/api/master_students?q=' + '김이박최정'[i % 5], None)),
+        ('parent GET', 'GET', lambda i: (f'/api/parent?parent_id={parents[i % len(parents)]}', None)),
+        ('recommend POST', 'POST', lambda i: ('/api/recommend', {'student_id': students[i % len(students)]})),
+        ('recommend POST class', 'POST', lambda i: ('/api/recommend', {'class_id': classes[i % len(classes)]})),
+        ('search GET', 'GET', lambda i: ('/api/search?q=' + ('민준', '서연', '010', '도윤')[i % 4], None)),
+        ('students GET', 'GET', lambda i: (f'/api/students?class_id={classes[i % len(classes)]}', None)),
+        ('students GET available', 'GET', lambda i: ('/api/students?mode=available&target_grade=중1', None)),
+    ]
+
+
+class _Worker:
+    # 스레드마다 keep-alive 연결을 서버(포트)별로 하나씩 재사용
+    local = threading.local()
+
+    @classmethod
+    def request(cls, harness, method, path, body):
+        conns = getattr(cls.local, 'conns', None)
+        if conns is None:
+            conns = cls.local.conns = {}
+        url = harness.url(path)
+        host_port, target = url[len('http://'):].split('/', 1)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+
+        for attempt in range(2):
+            conn = conns.get(host_port)
+            if conn is None:
+                conn = conns[host_port] = http.client.HTTPConnection(host_port, timeout=30)
+            try:
+                conn.request(method, '/' + target, body=data, headers=headers)
+                res = conn.getresponse()
+                res.read()
+                if res.will_close:
+                    conn.close()
+                    conns.pop(host_port, None)
+                return res.status
+            except (http.client.HTTPException, OSError):
+                # BaseHTTPRequestHandler 기본값(HTTP/1.0)은 응답마다 연결을 닫으므로 다시 연결
+                conn.close()
+                conns.pop(host_port, None)
+                if attempt:
+                    raise
+
+
+def run_scenario(harness, method, make_request, requests, concurrency):
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        path, body = make_request(i)
+        start = time.perf_counter()
+        try:
+            status = _Worker.request(harness, method, path, body)
+        except Exception:
+            status = 0
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            errors += not 200 <= status < 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'rps': requests / wall,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=400, help='시나리오당 요청 수')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=0, help='가짜 DB 쿼리당 왕복 지연')
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--only', default='', help='쉼표로 구분한 시나리오 이름 일부 (예: evaluate,dashboard)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    parser.add_argument('--asgi', action='store_true', help='파일별 서버 대신 ASGI 단일 앱으로 서빙')
+    args = parser.parse_args()
+
+    # 시드를 먼저 넣어야 ASGI 시작 시 워밍업이 빈 커리큘럼을 캐시하지 않음
+    harness = Harness(latency_ms=args.latency_ms, asgi=args.asgi)
+    ids = seed(harness.db, students=args.students)
+    harness.start()
+    only = [s.strip() for s in args.only.split(',') if s.strip()]
+
+    results = {}
+    for name, method, make_request in scenarios(ids):
+        if only and not any(o in name for o in only):
+            continue
+        # 워밍업 (모듈 캐시/커리큘럼 캐시/커넥션 생성)
+        run_scenario(harness, method, make_request, min(20, args.requests), args.concurrency)
+        results[name] = run_scenario(harness, method, make_request, args.requests, args.concurrency)
+        if not args.json:
+            r = results[name]
+            print(f"{name:24} {r['rps']:8.1f} req/s  p50 {r['p50']:7.2f}ms  p95 {r['p95']:7.2f}ms  "
+                  f"p99 {r['p99']:7.2f}ms  err {r['errors']}")
+
+    harness.stop()
+    if args.json:
+        print(json.dumps({'config': vars(args), 'results': results}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('VITE_SUPABASE_URL', 'http://fake.invalid')
+    os.environ.setdefault('VITE_SUPABASE_ANON_KEY', 'fake')
+    main()
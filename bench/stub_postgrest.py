@@ -0,0 +1,60 @@
+# 로컬 벤치마크용 PostgREST 흉내 서버
+# 모든 요청에 고정 지연(delay_ms)을 준 뒤 빈 결과를 돌려줍니다. (학생 조회만 한 행)
+# 실제 Supabase 없이 "DB 왕복 시간"만 재현해서 핸들러의 조회 패턴(순차 vs 병렬)을 비교하는 용도입니다.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+# create_client가 요구하는 JWT 형태의 가짜 키
+STUB_KEY = 'stub.stub.stub'
+
+
+def make_stub_handler(delay_ms):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive 허용 (실제 Supabase와 동일한 조건)
+        disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 delayed ACK(~40ms) 왜곡 방지
+
+        def _reply(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+
+            time.sleep(delay_ms / 1000)
+
+            # .single()/.maybe_single() 요청(Accept: vnd.pgrst.object)은 객체, 나머지는 배열로 응답
+            # 학생 목록 조회는 한 행을 돌려줌 (evaluate GET이 limit(1) 결과가 비면 404를 내므로)
+            if 'vnd.pgrst.object' in (self.headers.get('Accept') or ''):
+                body = json.dumps({'id': 1}).encode('utf-8')
+            elif self.command == 'GET' and self.path.startswith('/rest/v1/students?'):
+                body = json.dumps([{'id': 1}]).encode('utf-8')
+            else:
+                body = b'[]'
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Range', '0-0/0')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _reply
+        do_POST = _reply
+        do_PATCH = _reply
+        do_DELETE = _reply
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(delay_ms=50, port=0):
+    """
+    백그라운드 스레드에서 스텁 서버를 띄우고 (server, base_url)을 반환합니다.
+    끝나면 server.shutdown()으로 정리하세요.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_stub_handler(delay_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
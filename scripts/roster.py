@@ -0,0 +1,329 @@
+# 학생/수업 명단 일괄 등록·내보내기 (학기 초 온보딩용, 로컬에서 실행)
+#
+# 사용법 (저장소 루트에서, VITE_SUPABASE_URL / VITE_SUPABASE_ANON_KEY 필요):
+#   python -m scripts.roster import classes classes.csv
+#   python -m scripts.roster import students students.xlsx --errors errors.csv
+#   python -m scripts.roster import students students.csv --dry-run     # 검사만
+#   python -m scripts.roster export students > students.csv
+#   python -m scripts.roster export daily_logs --out logs.xlsx
+#
+# 등록
+# - 파일을 한 줄씩 읽어(CSV 또는 XLSX) 화면의 한 건 등록과 같은 규칙(api/_lib/roster.py)으로 정규화·검사하고
+#   CHUNK_SIZE 줄씩 묶어 insert 한 번으로 저장합니다. (수천 명도 HTTP 호출 수십 번)
+# - 읽기와 저장은 크기가 정해진 큐로 연결 → 저장이 밀리면 읽기가 기다림 (파일 크기와 무관하게 메모리 일정)
+# - 묶음 저장이 실패하면 그 묶음만 한 줄씩 다시 저장해서 문제 줄을 찾아냄 (나머지는 계속 진행)
+# - 학생 파일의 반은 class_id 또는 class_name(수업 이름)으로 지정
+# - 학생 등록이 끝나면 먼저 가입한 학부모를 일괄 재매칭 (api/_lib/jobs.py parents)
+#
+# 내보내기
+# - id 순 keyset 페이지(EXPORT_PAGE_SIZE)로 읽고, 다음 페이지 조회와 현재 페이지 쓰기를 겹쳐서 진행
+# - CSV는 엑셀에서 한글이 깨지지 않도록 BOM 포함 UTF-8, 목록 컬럼(selected_units 등)은 JSON 문자열
+# - XLSX 입출력은 openpyxl이 필요합니다 (pip install openpyxl, 배포 함수에는 필요 없음)
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+
+from api._lib.db import get_client
+from api._lib.jobs import run_parent_rematch
+from api._lib.roster import (
+    AVATAR_COLORS, CLASS_COLUMNS, class_row, clean_row, student_row, validate_class, validate_student
+)
+
+# insert 한 번에 보내는 줄 수
+CHUNK_SIZE = 500
+
+# 동시에 저장하는 묶음 수 / 읽기가 앞서 나갈 수 있는 묶음 수 (큐 크기)
+WRITERS = 4
+QUEUE_CHUNKS = WRITERS * 2
+
+EXPORT_PAGE_SIZE = 1000
+
+# 오류 메시지를 결과에 담는 최대 개수 (전체는 --errors 파일로)
+MAX_REPORTED_ERRORS = 20
+
+EXPORTS = {
+    'students': (
+        'id', 'name', 'school_name', 'phone_number', 'parent_phone_1', 'parent_phone_2',
+        'grade', 'avatar_color', 'class_id', 'parent_user_id', 'created_at'
+    ),
+    'classes': ('id',) + CLASS_COLUMNS + ('created_at',),
+    'daily_logs': (
+        'id', 'student_id', 'log_date', 'score', 'selected_units',
+        'homework', 'attitude', 'teacher_comment', 'created_at'
+    ),
+}
+
+
+def _load_openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise SystemExit("XLSX 파일은 openpyxl이 필요합니다: pip install openpyxl")
+    return openpyxl
+
+
+# --- 읽기 ---
+
+def read_rows(path):
+    """(줄 번호, {머리글: 값}) 를 한 줄씩 - 파일 전체를 메모리에 올리지 않음"""
+    if path.lower().endswith('.xlsx'):
+        workbook = _load_openpyxl().load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+            for line, values in enumerate(rows, start=2):
+                if any(v is not None for v in values):
+                    yield line, clean_row(dict(zip(header, values)))
+        finally:
+            workbook.close()
+        return
+
+    # utf-8-sig: 엑셀에서 저장한 CSV의 BOM 제거
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            row = clean_row(row)
+            if any(v is not None for v in row.values()):
+                yield line, row
+
+
+def _class_ids_by_name(supabase):
+    # 학생 파일의 class_name → class_id (이름이 겹치는 수업은 모호하므로 None)
+    by_name = {}
+    for cls in supabase.table('classes').select('id, name').execute().data or []:
+        by_name[cls['name']] = None if cls['name'] in by_name else cls['id']
+    return by_name
+
+
+def prepare_students(rows, class_ids_by_name):
+    """(줄 번호, 저장할 행 또는 None, 오류 메시지 또는 None)"""
+    for line, row in rows:
+        error = validate_student(row)
+        if error:
+            yield line, None, error
+            continue
+
+        record = student_row(row)
+        if not record['avatar_color']:
+            record['avatar_color'] = AVATAR_COLORS[line % len(AVATAR_COLORS)]
+
+        class_name = row.get('class_name')
+        if row.get('class_id'):
+            try:
+                record['class_id'] = int(float(row['class_id']))
+            except ValueError:
+                yield line, None, f"class_id 형식 오류: {row['class_id']}"
+                continue
+        elif class_name:
+            if class_name not in class_ids_by_name:
+                yield line, None, f"없는 수업: {class_name}"
+                continue
+            if class_ids_by_name[class_name] is None:
+                yield line, None, f"같은 이름의 수업이 여러 개입니다: {class_name} (class_id로 지정)"
+                continue
+            record['class_id'] = class_ids_by_name[class_name]
+        yield line, record, None
+
+
+def prepare_classes(rows):
+    for line, row in rows:
+        error = validate_class(row)
+        if error:
+            yield line, None, error
+            continue
+        yield line, class_row({column: row.get(column) for column in CLASS_COLUMNS}), None
+
+
+# --- 저장 ---
+
+class _Report:
+    def __init__(self, errors_file=None):
+        self.counts = {'read': 0, 'inserted': 0, 'invalid': 0, 'failed': 0, 'chunks': 0}
+        self.errors = []
+        self._writer = csv.writer(errors_file) if errors_file else None
+        if self._writer:
+            self._writer.writerow(['line', 'error'])
+        self._lock = threading.Lock()  # 저장 스레드들이 동시에 기록
+
+    def add(self, key, n=1):
+        with self._lock:
+            self.counts[key] += n
+
+    def error(self, key, line, message):
+        with self._lock:
+            self.counts[key] += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append({'line': line, 'error': message})
+            if self._writer:
+                self._writer.writerow([line, message])
+
+
+def _insert_chunk(supabase, table, lines, records, report):
+    try:
+        supabase.table(table).insert(records).execute()
+        report.add('inserted', len(records))
+        report.add('chunks')
+        return
+    except Exception as e:
+        print(f"Roster Chunk Error ({table} {lines[0]}~{lines[-1]}줄): {str(e)}", file=sys.stderr)
+
+    # 묶음은 트랜잭션 하나라 전부 실패 → 한 줄씩 다시 저장해서 문제 줄만 골라냄
+    for line, record in zip(lines, records):
+        try:
+            supabase.table(table).insert(record).execute()
+            report.add('inserted')
+        except Exception as e:
+            report.error('failed', line, str(e))
+
+
+def import_rows(supabase, table, prepared, dry_run=False, errors_file=None,
+                chunk_size=CHUNK_SIZE, writers=WRITERS):
+    """
+    prepare_*()가 만든 (줄, 행, 오류) 흐름을 묶음 insert로 저장합니다.
+    큐가 차면 읽기 쪽 put()이 기다리므로 동시에 메모리에 있는 행은 최대 (큐 + 저장 중) 묶음 수 × chunk_size
+    """
+    report = _Report(errors_file)
+    queue = Queue(maxsize=QUEUE_CHUNKS)
+
+    def writer():
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            _insert_chunk(supabase, table, *item, report)
+
+    threads = [] if dry_run else [threading.Thread(target=writer, daemon=True) for _ in range(writers)]
+    for t in threads:
+        t.start()
+
+    lines, records = [], []
+    try:
+        for line, record, error in prepared:
+            report.add('read')
+            if error:
+                report.error('invalid', line, error)
+                continue
+            lines.append(line)
+            records.append(record)
+            if len(records) >= chunk_size:
+                if not dry_run:
+                    queue.put((lines, records))
+                lines, records = [], []
+        if records and not dry_run:
+            queue.put((lines, records))
+    finally:
+        for _ in threads:
+            queue.put(None)
+        for t in threads:
+            t.join()
+
+    return {**report.counts, 'errors': report.errors}
+
+
+def run_import(supabase, kind, path, dry_run=False, errors_file=None):
+    started = time.monotonic()
+    rows = read_rows(path)
+    if kind == 'students':
+        result = import_rows(supabase, 'students', prepare_students(rows, _class_ids_by_name(supabase)),
+                             dry_run, errors_file)
+        if result['inserted']:
+            result['parents_matched'] = run_parent_rematch(supabase)['matched']
+    else:
+        result = import_rows(supabase, 'classes', prepare_classes(rows), dry_run, errors_file)
+    result['elapsed_ms'] = round((time.monotonic() - started) * 1000)
+    return result
+
+
+# --- 내보내기 ---
+
+def iter_table(supabase, table, columns, page_size=EXPORT_PAGE_SIZE):
+    """id 순 keyset 페이지로 한 행씩 (다음 페이지는 현재 페이지를 쓰는 동안 미리 조회)"""
+    def fetch(after_id):
+        query = supabase.table(table).select(','.join(columns)).order('id').limit(page_size)
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        return query.execute().data or []
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(fetch, None)
+        while True:
+            rows = future.result()
+            if len(rows) == page_size:
+                future = pool.submit(fetch, rows[-1]['id'])
+            yield from rows
+            if len(rows) < page_size:
+                return
+
+
+def _cell(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def run_export(supabase, table, out=None):
+    columns = EXPORTS[table]
+    rows = iter_table(supabase, table, columns)
+    count = 0
+
+    if out and out.lower().endswith('.xlsx'):
+        # write_only: 행을 바로 파일 버퍼로 흘려보냄
+        workbook = _load_openpyxl().Workbook(write_only=True)
+        sheet = workbook.create_sheet(table)
+        sheet.append(list(columns))
+        for row in rows:
+            sheet.append([_cell(row.get(c)) for c in columns])
+            count += 1
+        workbook.save(out)
+        return count
+
+    f = open(out, 'w', newline='', encoding='utf-8-sig') if out else sys.stdout
+    try:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_cell(row.get(c)) for c in columns])
+            count += 1
+    finally:
+        if out:
+            f.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='학생/수업 명단 일괄 등록·내보내기')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_import = sub.add_parser('import', help='CSV/XLSX 파일을 묶음 insert로 등록')
+    p_import.add_argument('kind', choices=('students', 'classes'))
+    p_import.add_argument('path')
+    p_import.add_argument('--dry-run', action='store_true', help='저장하지 않고 검사만')
+    p_import.add_argument('--errors', help='오류 줄을 기록할 CSV 파일')
+
+    p_export = sub.add_parser('export', help='테이블을 CSV/XLSX로 내보내기')
+    p_export.add_argument('table', choices=sorted(EXPORTS))
+    p_export.add_argument('--out', help='저장할 파일 (.csv/.xlsx, 생략하면 CSV를 표준 출력으로)')
+    args = parser.parse_args()
+
+    supabase = get_client()
+    if args.command == 'import':
+        errors_file = open(args.errors, 'w', newline='', encoding='utf-8-sig') if args.errors else None
+        try:
+            result = run_import(supabase, args.kind, args.path, args.dry_run, errors_file)
+        finally:
+            if errors_file:
+                errors_file.close()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        started = time.monotonic()
+        count = run_export(supabase, args.table, args.out)
+        print(json.dumps({"table": args.table, "rows": count,
+                          "elapsed_ms": round((time.monotonic() - started) * 1000)}), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
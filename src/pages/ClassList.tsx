@@ -105,7 +105,7 @@ export default function ClassList() {
         </div>
         {/* 집중 케어 (위험군) - 빨간색 강조 */}
         <div className="bg-red-50 p-5 rounded-2xl shadow-sm border border-red-100 flex flex-col items-center justify-center text-center cursor-pointer hover:bg-red-100 transition-colors"
-             onClick={() => stats.risk_students.length > 0 && alert("집중 케어 명단:\n" + stats.risk_students.map((s:any) => `${s.name}(${s.avg}점)`).join(', '))}>
+             onClick={() => stats.risk_students.length > 0 && alert("집중 케어 명단:\n" + stats.risk_students.map((s:any) => `${s.name}(${(s.reasons || []).map((r:any) => r.message).join(', ') || `${s.avg}점`})`).join('\n'))}>
             <div className="bg-white p-2 rounded-full mb-2 text-red-500"><AlertTriangle size={20}/></div>
             <p className="text-xs text-red-600 font-bold">집중 케어</p>
             <p className="text-2xl font-extrabold text-red-600">{stats.risk_students.length}명</p>
@@ -12,6 +12,8 @@ export default function ParentDashboard() {
   const [selectedChild, setSelectedChild] = useState<any>(null);
   const [logs, setLogs] = useState<any[]>([]);
   const [stats, setStats] = useState({ avgScore: 0, attendance: 0 });
+  // 자녀별 기록/통계 (첫 응답의 by_child) - 자녀를 바꿀 때 서버를 다시 부르지 않음
+  const [byChild, setByChild] = useState<Record<string, any>>({});
 
   // 모달 상태
   const [isDetailOpen, setIsDetailOpen] = useState(false);
@@ -31,6 +33,7 @@ export default function ParentDashboard() {
         const data = await res.json();
 
         setMyChildren(data.children || []);
+        setByChild(data.by_child || {});
         
         // 자녀가 있거나 선택된 경우 데이터 세팅
         if (data.children.length > 0) {
@@ -57,8 +60,15 @@ export default function ParentDashboard() {
   }, []);
 
   const handleSelectChild = (child: any) => {
-    setSelectedChild(child); // UI 즉시 반영을 위해 세팅
-    loadData(child.id); // 데이터 갱신 요청
+    setSelectedChild(child);
+    const snapshot = byChild[String(child.id)];
+    if (snapshot) {
+        // 첫 로딩에 모든 자녀 데이터가 들어 있으므로 화면에서 바로 전환
+        setLogs(snapshot.logs || []);
+        setStats(snapshot.stats || { avgScore: 0, attendance: 0 });
+    } else {
+        loadData(child.id); // 스냅샷에 없는 자녀만 서버에서 다시 받음
+    }
   };
 
   const handleLogout = async () => {
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { supabase } from '../supabaseClient';
-import { ChevronLeft, UserPlus, GraduationCap, CheckCircle, Clock, X } from 'lucide-react';
+import { ChevronLeft, UserPlus, GraduationCap, CheckCircle, Clock, X, Search } from 'lucide-react';
 
 export default function StudentList() {
   const { classId } = useParams();
@@ -16,6 +16,8 @@ export default function StudentList() {
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [availableStudents, setAvailableStudents] = useState<any[]>([]);
   const [selectedStudentIds, setSelectedStudentIds] = useState<number[]>([]);
+  // 후보는 추천 점수 상위 일부만 오므로, 목록에 없는 학생은 이름으로 찾음
+  const [candidateQuery, setCandidateQuery] = useState('');
 
   // 데이터 불러오기 (기존 로직 유지)
   const fetchData = async () => {
@@ -41,11 +43,16 @@ export default function StudentList() {
     fetchData();
   }, [classId]);
 
+  const fetchAvailable = async (query = '') => {
+    const res = await fetch(`/api/students?mode=available&class_id=${classId}&target_grade=${encodeURIComponent(targetGrade)}&q=${encodeURIComponent(query)}`);
+    const data = await res.json();
+    setAvailableStudents(data || []);
+  };
+
   const openImportModal = async () => {
     try {
-        const res = await fetch(`/api/students?mode=available&target_grade=${encodeURIComponent(targetGrade)}`);
-        const data = await res.json();
-        setAvailableStudents(data || []);
+        setCandidateQuery('');
+        await fetchAvailable();
         setSelectedStudentIds([]);
         setIsModalOpen(true);
     } catch (e) {
@@ -53,6 +60,16 @@ export default function StudentList() {
     }
   };
 
+  // 모달 안 이름 검색 (선택한 학생은 검색을 바꿔도 유지)
+  const handleCandidateSearch = async (e: React.FormEvent) => {
+    e.preventDefault();
+    try {
+        await fetchAvailable(candidateQuery.trim());
+    } catch (e) {
+        alert("목록을 불러오지 못했습니다.");
+    }
+  };
+
   const toggleSelect = (id: number) => {
     setSelectedStudentIds(prev => prev.includes(id) ? prev.filter(sid => sid !== id) : [...prev, id]);
   };
@@ -60,12 +77,14 @@ export default function StudentList() {
   const handleAddStudentsToClass = async () => {
     if (selectedStudentIds.length === 0) return;
     try {
-      await fetch('/api/students', {
+      const res = await fetch('/api/students', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ student_ids: selectedStudentIds, class_id: classId })
       });
-      alert(`${selectedStudentIds.length}명의 학생이 배정되었습니다.`);
+      const result = await res.json();
+      if (!res.ok || !result.success) throw new Error(result.error || "배정 실패");
+      alert(`${result.updated.length}명의 학생이 배정되었습니다.`);
       setIsModalOpen(false);
       fetchData();
     } catch (error) {
@@ -181,6 +200,17 @@ export default function StudentList() {
               </div>
               <button onClick={() => setIsModalOpen(false)} className="p-2 bg-gray-100 rounded-full hover:bg-gray-200"><X size={20}/></button>
             </div>
+
+            <form onSubmit={handleCandidateSearch} className="flex items-center bg-gray-50 border border-gray-200 rounded-xl px-3 py-2 mb-3 shrink-0">
+              <Search size={16} className="text-gray-400 mr-2" />
+              <input
+                type="text"
+                placeholder="이름으로 찾기 (엔터)"
+                className="flex-1 bg-transparent outline-none text-sm text-gray-700 placeholder-gray-400"
+                value={candidateQuery}
+                onChange={(e) => setCandidateQuery(e.target.value)}
+              />
+            </form>
             
             <div className="flex-1 overflow-y-auto space-y-2 pr-1 mb-4 custom-scrollbar">
               {availableStudents.length > 0 ? availableStudents.map((s) => {
@@ -5,6 +5,10 @@ export default function StudentMaster() {
   const [students, setStudents] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
+  // 다음 페이지 커서 (응답의 X-Next-Cursor 헤더, 없으면 마지막 페이지)
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [activeQuery, setActiveQuery] = useState('');
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // 모달 상태
   const [isModalOpen, setIsModalOpen] = useState(false);
@@ -18,12 +22,15 @@ export default function StudentMaster() {
   const [gradeNum, setGradeNum] = useState('1');
 
   // [최적화 1] 검색 기능이 포함된 API 호출
+  // 서버는 한 번에 100명씩 보내고 다음 페이지 커서를 X-Next-Cursor 헤더로 줍니다.
   const fetchStudents = async (query = '') => {
     setLoading(true);
     try {
         const res = await fetch(`/api/master_students?q=${encodeURIComponent(query)}`);
         const data = await res.json();
         setStudents(data || []);
+        setNextCursor(res.headers.get('X-Next-Cursor'));
+        setActiveQuery(query);
     } catch (e) {
         console.error("데이터 로딩 실패");
     } finally {
@@ -31,6 +38,22 @@ export default function StudentMaster() {
     }
   };
 
+  // [더 보기] 같은 검색어로 다음 페이지를 이어 붙임
+  const fetchMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+        const res = await fetch(`/api/master_students?q=${encodeURIComponent(activeQuery)}&cursor=${encodeURIComponent(nextCursor)}`);
+        const data = await res.json();
+        setStudents(prev => [...prev, ...(data || [])]);
+        setNextCursor(res.headers.get('X-Next-Cursor'));
+    } catch (e) {
+        console.error("데이터 로딩 실패");
+    } finally {
+        setLoadingMore(false);
+    }
+  };
+
   // 초기 로딩
   useEffect(() => {
     fetchStudents();
@@ -151,6 +174,11 @@ export default function StudentMaster() {
             </table>
         )}
         {!loading && students.length === 0 && <div className="p-10 text-center text-gray-400">검색 결과가 없습니다.</div>}
+        {!loading && nextCursor && (
+            <button onClick={fetchMore} disabled={loadingMore} className="w-full p-4 text-sm font-bold text-blue-600 hover:bg-gray-50 border-t border-gray-100 disabled:text-gray-400">
+                {loadingMore ? '불러오는 중...' : '더 보기'}
+            </button>
+        )}
       </div>
 
       {/* 모달 UI (이전과 동일하지만 API 연동됨) */}
@@ -0,0 +1,37 @@
+-- 대시보드 집계를 DB에서 한 번에 계산하는 함수
+-- api/dashboard.py가 행 전체를 가져와 len()/평균을 내던 것을 대체합니다.
+-- 응답 형태는 기존 do_GET과 동일: today_classes, total_students, today_evals, risk_students
+
+create index if not exists daily_logs_created_at_idx on daily_logs (created_at desc);
+
+create or replace function dashboard_summary(p_today date, p_weekday text)
+returns json
+language sql
+stable
+as $$
+  with recent_logs as (
+    -- 최근 로그 50개 (기존 로직과 동일한 범위)
+    select student_id, score, created_at
+    from daily_logs
+    order by created_at desc
+    limit 50
+  ),
+  risk as (
+    select s.name, s.grade, round(avg(coalesce(r.score, 0))::numeric, 1) as avg,
+           max(r.created_at) as last_at
+    from recent_logs r
+    join students s on s.id = r.student_id
+    group by s.id, s.name, s.grade
+    having avg(coalesce(r.score, 0)) < 70
+  )
+  select json_build_object(
+    'today_classes', (select count(*) from classes where schedule ilike '%' || p_weekday || '%'),
+    'total_students', (select count(*) from students),
+    'today_evals', (select count(*) from daily_logs where created_at >= p_today::timestamp),
+    'risk_students', coalesce(
+      -- 최근에 기록된 학생부터 (기존 dict 삽입 순서와 동일)
+      (select json_agg(json_build_object('name', name, 'grade', grade, 'avg', avg) order by last_at desc) from risk),
+      '[]'::json
+    )
+  );
+$$;
@@ -0,0 +1,29 @@
+-- 커리큘럼 캐시 무효화용 버전 카운터
+-- api/_lib/curriculum.py가 TTL이 지날 때마다 이 값(작은 1행)만 확인하고,
+-- 바뀌었을 때만 curriculum 전체를 다시 가져옵니다.
+
+create table if not exists cache_versions (
+  name text primary key,
+  version bigint not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+insert into cache_versions (name) values ('curriculum') on conflict (name) do nothing;
+
+-- curriculum이 어떤 경로로든(대시보드, SQL, API) 수정되면 버전 증가
+create or replace function bump_curriculum_version()
+returns trigger
+language plpgsql
+as $$
+begin
+  update cache_versions
+     set version = version + 1, updated_at = now()
+   where name = 'curriculum';
+  return null;
+end;
+$$;
+
+drop trigger if exists curriculum_version_bump on curriculum;
+create trigger curriculum_version_bump
+after insert or update or delete or truncate on curriculum
+for each statement execute function bump_curriculum_version();
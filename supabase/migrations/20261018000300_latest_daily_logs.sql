@@ -0,0 +1,17 @@
+-- 학생별 가장 최근 평가 기록 1건씩 (DISTINCT ON)
+-- api/recommend.py 배치 모드가 반 전체 / 학생 목록의 최신 기록을 쿼리 한 번으로 가져올 때 사용합니다.
+-- 반드시 student_id(DISTINCT ON 키)로 거를 것: class_id 조건은 DISTINCT ON 아래로 내려가지 않아
+-- daily_logs 전체를 조인·정렬하게 됩니다. (반 단위는 명단을 먼저 받아 student_id in (...) 로)
+
+create index if not exists daily_logs_student_created_idx
+  on daily_logs (student_id, created_at desc);
+
+create or replace view latest_daily_logs
+with (security_invoker = true)
+as
+select distinct on (l.student_id)
+  l.*,
+  s.class_id
+from daily_logs l
+join students s on s.id = l.student_id
+order by l.student_id, l.created_at desc;
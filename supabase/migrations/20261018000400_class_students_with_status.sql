@@ -0,0 +1,21 @@
+-- 반 학생 목록 + 오늘 평가 완료 여부(isCompleted)를 한 번에 계산
+-- api/students.py list 모드가 학생 id 전체를 in() 필터로 보내고 Python에서 대조하던 것을 대체합니다.
+-- exists 서브쿼리는 daily_logs(student_id, created_at desc) 인덱스를 그대로 탑니다.
+
+create index if not exists students_class_name_idx on students (class_id, name);
+
+create or replace function class_students_with_status(p_class_id bigint, p_since timestamptz)
+returns setof jsonb
+language sql
+stable
+as $$
+  select to_jsonb(s) || jsonb_build_object(
+    'isCompleted', exists (
+      select 1 from daily_logs l
+      where l.student_id = s.id and l.created_at >= p_since
+    )
+  )
+  from students s
+  where s.class_id = p_class_id
+  order by s.name;
+$$;
@@ -0,0 +1,82 @@
+-- 수업 시간표 구조화 컬럼 (api/_lib/schedule.py와 같은 규칙)
+--   schedule_days  : 요일 번호 배열 (월=0 ... 일=6)
+--   schedule_slots : 월요일 00:00부터의 분 단위 시각 배열
+-- 두 컬럼은 schedule에서 트리거로 계산하므로 어떤 경로로 넣거나 고쳐도 항상 맞습니다.
+-- (api/classes.py POST도 같은 값을 미리 채워 보내지만 트리거가 다시 계산)
+
+alter table classes add column if not exists schedule_days smallint[];
+alter table classes add column if not exists schedule_slots integer[];
+
+-- '월요일 오후 07:00 / 수요일 오후 07:00' → {1140, 4020}
+create or replace function parse_schedule_slots(p_schedule text)
+returns integer[]
+language sql
+immutable
+as $$
+  select coalesce(array_agg(distinct
+    (position(m[1] in '월화수목금토일') - 1) * 1440
+    + ((m[3]::int % 12) + case when m[2] = '오후' then 12 else 0 end) * 60
+    + m[4]::int
+  ), '{}')
+  from regexp_matches(coalesce(p_schedule, ''), '(월|화|수|목|금|토|일)요일 (오전|오후) (\d{1,2}):(\d{2})', 'g') as m;
+$$;
+
+create or replace function set_class_schedule_fields()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.schedule_slots := parse_schedule_slots(new.schedule);
+  new.schedule_days := coalesce((
+    select array_agg(distinct (slot / 1440)::smallint order by (slot / 1440)::smallint)
+    from unnest(new.schedule_slots) as slot
+  ), '{}');
+  return new;
+end;
+$$;
+
+drop trigger if exists classes_schedule_fields on classes;
+create trigger classes_schedule_fields
+before insert or update of schedule on classes
+for each row execute function set_class_schedule_fields();
+
+-- 기존 수업 백필 (트리거가 두 컬럼을 계산)
+update classes set schedule = schedule where schedule_slots is null or schedule_days is null;
+
+-- "오늘 수업" 조회: schedule_days @> array[요일]
+create index if not exists classes_schedule_days_idx on classes using gin (schedule_days);
+
+-- 대시보드 집계가 ilike '%월요일%' 대신 인덱스를 쓰도록 교체
+drop function if exists dashboard_summary(date, text);
+
+create or replace function dashboard_summary(p_today date, p_dow smallint)
+returns json
+language sql
+stable
+as $$
+  with recent_logs as (
+    -- 최근 로그 50개 (기존 로직과 동일한 범위)
+    select student_id, score, created_at
+    from daily_logs
+    order by created_at desc
+    limit 50
+  ),
+  risk as (
+    select s.name, s.grade, round(avg(coalesce(r.score, 0))::numeric, 1) as avg,
+           max(r.created_at) as last_at
+    from recent_logs r
+    join students s on s.id = r.student_id
+    group by s.id, s.name, s.grade
+    having avg(coalesce(r.score, 0)) < 70
+  )
+  select json_build_object(
+    'today_classes', (select count(*) from classes where schedule_days @> array[p_dow]),
+    'total_students', (select count(*) from students),
+    'today_evals', (select count(*) from daily_logs where created_at >= p_today::timestamp),
+    'risk_students', coalesce(
+      -- 최근에 기록된 학생부터 (기존 dict 삽입 순서와 동일)
+      (select json_agg(json_build_object('name', name, 'grade', grade, 'avg', avg) order by last_at desc) from risk),
+      '[]'::json
+    )
+  );
+$$;
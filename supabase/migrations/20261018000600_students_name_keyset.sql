@@ -0,0 +1,3 @@
+-- api/master_students.py GET의 (name, id) keyset 페이지네이션용 인덱스
+-- order by name, id + (name, id) > (커서) 조건이 인덱스 범위 탐색 한 번으로 처리됩니다.
+create index if not exists students_name_id_idx on students (name, id);
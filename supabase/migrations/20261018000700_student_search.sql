@@ -0,0 +1,76 @@
+-- 학생 이름/전화번호 검색
+-- - 전화번호는 숫자만 남긴 *_digits 컬럼을 같이 저장 (하이픈 유무와 무관하게 매칭)
+-- - 이름/번호에 trigram 인덱스 → '%검색어%' 부분 검색도 인덱스 사용
+-- - search_students(): 정확 일치 > 접두 일치 > 유사도 순으로 정렬된 결과
+
+create extension if not exists pg_trgm;
+
+-- api/_lib/phone.py normalize_phone()과 같은 규칙
+create or replace function normalize_phone(p_phone text)
+returns text
+language sql
+immutable
+as $$
+  select regexp_replace(
+    regexp_replace(coalesce(p_phone, ''), '\D', '', 'g'),
+    '^82(1\d{8,9})$', '0\1'
+  );
+$$;
+
+alter table students
+  add column if not exists phone_digits text
+  generated always as (normalize_phone(phone_number)) stored;
+alter table students
+  add column if not exists parent_phone_1_digits text
+  generated always as (normalize_phone(parent_phone_1)) stored;
+
+create index if not exists students_name_trgm_idx on students using gin (name gin_trgm_ops);
+create index if not exists students_phone_digits_trgm_idx on students using gin (phone_digits gin_trgm_ops);
+-- search_students()의 '%번호%' 부분 검색은 학부모 번호에도 trigram 인덱스가 있어야
+-- OR 조건 전체가 BitmapOr로 인덱스를 탐 (하나라도 없으면 전체 순차 스캔)
+create index if not exists students_parent_phone_1_digits_trgm_idx on students using gin (parent_phone_1_digits gin_trgm_ops);
+-- 학부모 가입 시 자동 매칭(api/register.py)은 정확 일치 조회
+create index if not exists students_parent_phone_1_digits_idx on students (parent_phone_1_digits);
+
+create or replace function search_students(p_query text, p_limit int default 20)
+returns setof jsonb
+language sql
+stable
+as $$
+  with params as (
+    select
+      trim(p_query) as q,
+      -- ilike 패턴용 이스케이프 (%, _ 를 글자 그대로 검색)
+      replace(replace(replace(trim(p_query), '\', '\\'), '%', '\%'), '_', '\_') as q_like,
+      normalize_phone(p_query) as digits
+  ),
+  ranked as (
+    select
+      s.*,
+      (case
+         when s.name = p.q then 3
+         when s.name ilike p.q_like || '%' then 2
+         else 0
+       end)
+      + similarity(s.name, p.q)
+      + (case
+           when length(p.digits) >= 3
+            and (s.phone_digits like '%' || p.digits || '%'
+                 or s.parent_phone_1_digits like '%' || p.digits || '%')
+           then 1.5 else 0
+         end) as rank
+    from students s, params p
+    where p.q <> ''
+      and (
+        s.name ilike '%' || p.q_like || '%'
+        or s.name % p.q
+        or (length(p.digits) >= 3 and (
+              s.phone_digits like '%' || p.digits || '%'
+              or s.parent_phone_1_digits like '%' || p.digits || '%'))
+      )
+  )
+  select to_jsonb(r) - 'rank' || jsonb_build_object('rank', round(r.rank::numeric, 3))
+  from ranked r
+  order by r.rank desc, r.name, r.id
+  limit least(greatest(p_limit, 1), 100);
+$$;
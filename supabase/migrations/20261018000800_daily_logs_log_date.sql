@@ -0,0 +1,12 @@
+-- 평가 기록의 "수업 날짜" 컬럼 + (student_id, log_date) 유니크 인덱스
+-- api/evaluate.py POST가 on_conflict=student_id,log_date 로 upsert 하여
+-- 같은 학생/같은 날 평가를 다시 보내도 중복 행이 생기지 않습니다. (일괄 입력 재시도에도 안전)
+--
+-- 기존 행은 log_date를 비워 둡니다(NULL은 유니크 충돌 없음) → 과거 중복 기록을 지우지 않고 적용 가능.
+-- 기본값은 컬럼 추가 후에 지정해야 기존 행이 채워지지 않습니다.
+
+alter table daily_logs add column if not exists log_date date;
+alter table daily_logs alter column log_date set default current_date;
+
+create unique index if not exists daily_logs_student_log_date_key
+  on daily_logs (student_id, log_date);
@@ -0,0 +1,136 @@
+-- 학생별 누적 점수 통계 (daily_logs 쓰기 시점에 갱신, 읽기는 행 1개)
+-- api/parent.py(학부모 통계)와 dashboard_summary(집중 케어 학생)가 원본 로그를 매번 다시 집계하던 것을 대체합니다.
+--
+--   log_count / score_count / score_sum : 전체 누적
+--   last_*                              : 가장 최근 기록
+--   recent_scores                       : 최근 30건 점수 (최신이 앞, 점수 없는 기록은 NULL)
+--   recent_avg                          : recent_scores 중 점수 있는 것들의 평균
+
+create table if not exists student_stats (
+  student_id bigint primary key references students (id) on delete cascade,
+  log_count integer not null default 0,
+  score_count integer not null default 0,
+  score_sum numeric not null default 0,
+  last_score numeric,
+  last_units jsonb,
+  last_log_at timestamptz,
+  recent_scores numeric[] not null default '{}',
+  recent_avg numeric,
+  updated_at timestamptz not null default now()
+);
+
+-- 한 학생의 통계를 원본 로그에서 다시 계산 (수정/삭제, 과거 날짜 기록 입력 시)
+create or replace function recompute_student_stats(p_student_id bigint)
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  insert into student_stats as st (
+    student_id, log_count, score_count, score_sum,
+    last_score, last_units, last_log_at, recent_scores, recent_avg, updated_at
+  )
+  select
+    p_student_id,
+    count(*),
+    count(l.score),
+    coalesce(sum(l.score), 0),
+    (array_agg(l.score::numeric order by l.created_at desc))[1],
+    (array_agg(to_jsonb(l.selected_units) order by l.created_at desc))[1],
+    max(l.created_at),
+    coalesce((array_agg(l.score::numeric order by l.created_at desc))[1:30], '{}'),
+    null,
+    now()
+  from daily_logs l
+  where l.student_id = p_student_id
+  on conflict (student_id) do update set
+    log_count = excluded.log_count,
+    score_count = excluded.score_count,
+    score_sum = excluded.score_sum,
+    last_score = excluded.last_score,
+    last_units = excluded.last_units,
+    last_log_at = excluded.last_log_at,
+    recent_scores = excluded.recent_scores,
+    updated_at = excluded.updated_at;
+
+  update student_stats
+     set recent_avg = (select avg(x) from unnest(recent_scores) as x)
+   where student_id = p_student_id;
+$$;
+
+create or replace function track_student_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  st student_stats%rowtype;
+  new_window numeric[];
+begin
+  if tg_op = 'INSERT' then
+    insert into student_stats (student_id) values (new.student_id) on conflict do nothing;
+    select * into st from student_stats where student_id = new.student_id for update;
+
+    if new.created_at >= coalesce(st.last_log_at, '-infinity'::timestamptz) then
+      -- 일반적인 경우(가장 최근 기록 추가): O(1) 증분 갱신
+      new_window := (array[new.score::numeric] || st.recent_scores)[1:30];
+      update student_stats set
+        log_count = st.log_count + 1,
+        score_count = st.score_count + (new.score is not null)::int,
+        score_sum = st.score_sum + coalesce(new.score, 0),
+        last_score = new.score,
+        last_units = to_jsonb(new.selected_units),
+        last_log_at = new.created_at,
+        recent_scores = new_window,
+        recent_avg = (select avg(x) from unnest(new_window) as x),
+        updated_at = now()
+      where student_id = new.student_id;
+    else
+      perform recompute_student_stats(new.student_id);
+    end if;
+    return null;
+  end if;
+
+  -- 수정(upsert로 같은 날 재평가 포함) / 삭제: 해당 학생만 다시 계산
+  perform recompute_student_stats(old.student_id);
+  if tg_op = 'UPDATE' and new.student_id is distinct from old.student_id then
+    perform recompute_student_stats(new.student_id);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists daily_logs_student_stats on daily_logs;
+create trigger daily_logs_student_stats
+after insert or update or delete on daily_logs
+for each row execute function track_student_stats();
+
+-- 기존 기록 백필
+select recompute_student_stats(s.id)
+from students s
+where exists (select 1 from daily_logs l where l.student_id = s.id);
+
+-- 집중 케어 학생: 최근 50개 로그에 등장한 학생만 보던 것을, 모든 학생의 최근 30건 평균으로 교체
+create or replace function dashboard_summary(p_today date, p_dow smallint)
+returns json
+language sql
+stable
+as $$
+  with risk as (
+    select s.name, s.grade, round(st.recent_avg, 1) as avg, st.last_log_at
+    from student_stats st
+    join students s on s.id = st.student_id
+    where st.recent_avg < 70
+  )
+  select json_build_object(
+    'today_classes', (select count(*) from classes where schedule_days @> array[p_dow]),
+    'total_students', (select count(*) from students),
+    'today_evals', (select count(*) from daily_logs where created_at >= p_today::timestamp),
+    'risk_students', coalesce(
+      -- 최근에 기록된 학생부터
+      (select json_agg(json_build_object('name', name, 'grade', grade, 'avg', avg) order by last_log_at desc) from risk),
+      '[]'::json
+    )
+  );
+$$;
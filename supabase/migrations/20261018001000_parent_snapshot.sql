@@ -0,0 +1,47 @@
+-- 학부모 화면 스냅샷: 자녀 전체 + 자녀별 최근 기록 30건 + 누적 통계를 한 번에
+-- api/parent.py가 (자녀 목록 → 선택 자녀 기록) 두 번 왕복하던 것을 대체하고,
+-- 자녀를 바꿔 볼 때도 서버를 다시 호출하지 않도록 모든 자녀 데이터를 같이 돌려줍니다.
+
+create index if not exists students_parent_user_id_idx on students (parent_user_id);
+
+create or replace function parent_snapshot(p_parent_id uuid)
+returns json
+language sql
+stable
+as $$
+  with children as (
+    select s.*
+    from students s
+    where s.parent_user_id = p_parent_id
+  )
+  select json_build_object(
+    'children', coalesce((
+      select json_agg(
+        to_jsonb(c) || jsonb_build_object(
+          'classes', (
+            select jsonb_build_object('name', cl.name, 'schedule', cl.schedule)
+            from classes cl where cl.id = c.class_id
+          ),
+          'student_stats', (
+            select jsonb_build_object('recent_avg', st.recent_avg, 'recent_scores', st.recent_scores)
+            from student_stats st where st.student_id = c.id
+          )
+        )
+        order by c.id
+      )
+      from children c
+    ), '[]'::json),
+    'logs', coalesce((
+      select json_object_agg(c.id, coalesce((
+        select json_agg(l order by l.created_at desc)
+        from (
+          select * from daily_logs
+          where student_id = c.id
+          order by created_at desc
+          limit 30
+        ) l
+      ), '[]'::json))
+      from children c
+    ), '{}'::json)
+  );
+$$;
@@ -0,0 +1,75 @@
+-- 반 명단 동기화: 원하는 학생 id 목록을 받아 현재 명단과의 차이만 적용
+-- api/students.py POST mode='sync' 에서 호출합니다.
+-- - 빠지는 학생: update 한 번 (class_id → null)
+-- - 들어오는 학생: update 한 번 (이미 이 반인 학생은 건드리지 않음)
+-- 함수 하나가 트랜잭션 하나라서 중간에 실패하면 전부 롤백됩니다.
+-- 다른 반에 이미 배정된 학생은 p_allow_move가 true일 때만 옮기고, 아니면 conflicts로 보고합니다.
+
+create or replace function sync_class_roster(
+  p_class_id bigint,
+  p_student_ids bigint[],
+  p_allow_move boolean default false
+)
+returns json
+language plpgsql
+as $$
+declare
+  v_ids bigint[] := coalesce(p_student_ids, '{}');
+  v_added json;
+  v_removed json;
+  v_conflicts json;
+  v_missing json;
+begin
+  -- 같은 반 명단을 동시에 편집하면 순서대로 적용되도록 반 행을 잠금
+  perform 1 from classes where id = p_class_id for update;
+  if not found then
+    raise exception 'class % not found', p_class_id using errcode = 'P0002';
+  end if;
+
+  select coalesce(json_agg(x order by x), '[]') into v_missing
+  from unnest(v_ids) x
+  where not exists (select 1 from students s where s.id = x);
+
+  select coalesce(json_agg(json_build_object('id', s.id, 'class_id', s.class_id) order by s.id), '[]')
+  into v_conflicts
+  from students s
+  where s.id = any(v_ids)
+    and s.class_id is not null
+    and s.class_id <> p_class_id
+    and not p_allow_move;
+
+  with removed as (
+    update students
+    set class_id = null
+    where class_id = p_class_id
+      and id <> all(v_ids)
+    returning id
+  )
+  select coalesce(json_agg(id order by id), '[]') into v_removed from removed;
+
+  with target as (
+    select id, class_id as from_class_id
+    from students
+    where id = any(v_ids)
+      and class_id is distinct from p_class_id
+      and (class_id is null or p_allow_move)
+    for update
+  ), added as (
+    update students s
+    set class_id = p_class_id
+    from target t
+    where s.id = t.id
+    returning s.id, t.from_class_id
+  )
+  select coalesce(json_agg(json_build_object('id', id, 'from_class_id', from_class_id) order by id), '[]')
+  into v_added
+  from added;
+
+  return json_build_object(
+    'added', v_added,
+    'removed', v_removed,
+    'conflicts', v_conflicts,
+    'missing', v_missing
+  );
+end;
+$$;
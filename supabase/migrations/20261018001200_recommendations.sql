@@ -0,0 +1,109 @@
+-- 야간 일괄 계산한 다음 수업 추천 (api/cron.py?job=recommendations → api/_lib/jobs.py)
+-- 평가 화면(api/evaluate.py GET)과 단일 추천(api/recommend.py)은 이 행을 학생 조회에 붙여 읽고,
+-- 행이 없을 때만 그 자리에서 계산합니다.
+--
+-- 행이 낡지 않게:
+--   * daily_logs가 바뀌면 그 학생의 추천 행을 지움 (다음 조회는 즉시 계산, 다음 배치에서 다시 채움)
+--   * curriculum이 바뀌면 전체를 지움 (next_title/다음 단원이 달라질 수 있음)
+--   * 저장 시 계산에 쓴 마지막 기록 시각/커리큘럼 버전이 그대로인 경우에만 저장 (계산 도중 바뀐 학생은 건너뜀)
+
+create table if not exists recommendations (
+  student_id bigint primary key references students (id) on delete cascade,
+  action text not null,             -- api/_lib/recommend_engine.py ACTIONS
+  unit_ids bigint[] not null default '{}',
+  last_score numeric,
+  next_title text,
+  based_on_log_at timestamptz,      -- 계산에 쓴 마지막 기록 시각 (기록 없으면 NULL)
+  computed_at timestamptz not null default now()
+);
+
+create or replace function invalidate_student_recommendation()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    delete from recommendations where student_id = old.student_id;
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    delete from recommendations where student_id = new.student_id;
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists daily_logs_invalidate_recommendation on daily_logs;
+create trigger daily_logs_invalidate_recommendation
+after insert or update or delete on daily_logs
+for each row execute function invalidate_student_recommendation();
+
+create or replace function invalidate_all_recommendations()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  delete from recommendations;
+  return null;
+end;
+$$;
+
+drop trigger if exists curriculum_invalidate_recommendations on curriculum;
+create trigger curriculum_invalidate_recommendations
+after insert or update or delete or truncate on curriculum
+for each statement execute function invalidate_all_recommendations();
+
+-- 배치 입력: 반에 배정된 학생 중 추천 행이 없는 학생의 마지막 기록 요약 (student_stats에서 1행씩)
+create or replace function recommendation_inputs(p_limit integer default 1000)
+returns table (student_id bigint, last_score numeric, last_max_unit bigint, last_log_at timestamptz)
+language sql
+stable
+as $$
+  select
+    s.id,
+    st.last_score,
+    (select max(u::bigint) from jsonb_array_elements_text(coalesce(st.last_units, '[]'::jsonb)) as u),
+    st.last_log_at
+  from students s
+  left join student_stats st on st.student_id = s.id
+  where s.class_id is not null
+    and not exists (select 1 from recommendations r where r.student_id = s.id)
+  order by s.id
+  limit greatest(1, least(p_limit, 5000));
+$$;
+
+-- 배치 결과 저장 (저장한 행 수 반환)
+create or replace function store_recommendations(p_rows jsonb, p_curriculum_version bigint)
+returns integer
+language plpgsql
+as $$
+declare
+  v_count integer;
+begin
+  -- 계산 도중 커리큘럼이 바뀌었으면 전부 버림 (다음 실행에서 새 커리큘럼으로 계산)
+  if p_curriculum_version is distinct from (select version from cache_versions where name = 'curriculum') then
+    return 0;
+  end if;
+
+  insert into recommendations as rec (student_id, action, unit_ids, last_score, next_title, based_on_log_at, computed_at)
+  select r.student_id, r.action, coalesce(r.unit_ids, '{}'), r.last_score, r.next_title, r.based_on_log_at, now()
+  from jsonb_to_recordset(p_rows) as r(
+    student_id bigint, action text, unit_ids bigint[], last_score numeric, next_title text, based_on_log_at timestamptz
+  )
+  left join student_stats st on st.student_id = r.student_id
+  where r.based_on_log_at is not distinct from st.last_log_at
+  on conflict (student_id) do update set
+    action = excluded.action,
+    unit_ids = excluded.unit_ids,
+    last_score = excluded.last_score,
+    next_title = excluded.next_title,
+    based_on_log_at = excluded.based_on_log_at,
+    computed_at = excluded.computed_at;
+
+  get diagnostics v_count = row_count;
+  return v_count;
+end;
+$$;
@@ -0,0 +1,60 @@
+-- 학부모 ↔ 자녀 자동 매칭
+-- - 두 번째 학부모 번호(parent_phone_2)도 숫자만 남긴 *_digits 컬럼 + 인덱스로 매칭
+-- - 가입한 학부모의 정규화 번호를 user_roles.phone_digits에 저장 → 나중에 학생이 등록돼도 다시 매칭 가능
+-- - rematch_parents(): 아직 학부모가 연결되지 않은 학생 전체를 update 한 번으로 연결
+--   (학기 초 명단 일괄 등록 후 api/register.py mode='rematch' 또는 python -m api._lib.jobs parents)
+
+alter table students add column if not exists parent_phone_2 text;
+alter table students
+  add column if not exists parent_phone_2_digits text
+  generated always as (normalize_phone(parent_phone_2)) stored;
+
+-- 가입 시 매칭은 parent_phone_1_digits = x or parent_phone_2_digits = x (인덱스 두 개를 BitmapOr)
+create index if not exists students_parent_phone_2_digits_idx on students (parent_phone_2_digits)
+  where parent_phone_2_digits <> '';
+-- 일괄 매칭은 연결 안 된 학생만 훑음
+create index if not exists students_unlinked_parent_idx on students (id)
+  where parent_user_id is null;
+
+alter table user_roles add column if not exists phone_digits text;
+create index if not exists user_roles_parent_phone_digits_idx on user_roles (phone_digits)
+  where role = 'parent' and phone_digits <> '';
+
+-- 이미 가입한 학부모는 연결된 자녀의 parent_phone_1 번호로 채워 둠 (가입 시 번호는 저장하지 않았음)
+update user_roles ur
+set phone_digits = s.parent_phone_1_digits
+from students s
+where s.parent_user_id = ur.id
+  and ur.role = 'parent'
+  and ur.phone_digits is null
+  and s.parent_phone_1_digits <> '';
+
+-- 연결한 학생 수 반환
+-- 한 학생에 번호가 맞는 학부모 계정이 여럿이면 parent_phone_1 쪽 계정을 우선
+create or replace function rematch_parents()
+returns integer
+language plpgsql
+as $$
+declare
+  v_count integer;
+begin
+  with candidates as (
+    select distinct on (s.id) s.id as student_id, p.id as parent_id
+    from students s
+    join user_roles p
+      on p.role = 'parent'
+     and p.phone_digits <> ''
+     and p.phone_digits in (s.parent_phone_1_digits, s.parent_phone_2_digits)
+    where s.parent_user_id is null
+    order by s.id, (p.phone_digits = s.parent_phone_1_digits) desc, p.id
+  )
+  update students s
+  set parent_user_id = c.parent_id
+  from candidates c
+  where s.id = c.student_id
+    and s.parent_user_id is null;
+
+  get diagnostics v_count = row_count;
+  return v_count;
+end;
+$$;
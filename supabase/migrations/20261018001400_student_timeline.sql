@@ -0,0 +1,63 @@
+-- 학생별 성취도 추이: 기록을 주/월 단위로 묶어 서버에서 집계 (api/timeline.py)
+-- 응답 크기는 기록 수가 아니라 구간 수에 비례합니다. (1년치 주 단위 = 최대 53구간)
+-- 열(column) 단위 배열로 돌려줘서 같은 키 이름을 구간마다 반복하지 않습니다.
+--   { bucket, starts: [...], count: [...], mean: [...], min: [...], max: [...], units: [...], max_unit: [...] }
+-- - 날짜는 수업 날짜(log_date), 예전 행처럼 비어 있으면 created_at의 날짜
+-- - 주는 월요일 시작 (date_trunc('week'))
+-- - units: 구간에 다룬 서로 다른 단원 수, max_unit: 구간에서 가장 앞선 단원 id
+-- 기록이 없는 구간은 빠집니다.
+
+create or replace function student_timeline(
+  p_student_id bigint,
+  p_bucket text default 'week',
+  p_from date default null,
+  p_to date default null
+)
+returns json
+language sql
+stable
+as $$
+  with logs as (
+    select
+      date_trunc(
+        case when p_bucket = 'month' then 'month' else 'week' end,
+        coalesce(l.log_date, l.created_at::date)
+      )::date as bucket_start,
+      l.score,
+      l.selected_units
+    from daily_logs l
+    where l.student_id = p_student_id
+      and (p_from is null or coalesce(l.log_date, l.created_at::date) >= p_from)
+      and (p_to is null or coalesce(l.log_date, l.created_at::date) <= p_to)
+  ),
+  buckets as (
+    select
+      bucket_start,
+      count(*) as n,
+      round(avg(score), 1) as mean,
+      min(score) as min_score,
+      max(score) as max_score
+    from logs
+    group by bucket_start
+  ),
+  units as (
+    select
+      bucket_start,
+      count(distinct u::bigint) as n_units,
+      max(u::bigint) as max_unit
+    from logs, jsonb_array_elements_text(coalesce(to_jsonb(selected_units), '[]'::jsonb)) as u
+    group by bucket_start
+  )
+  select json_build_object(
+    'bucket', case when p_bucket = 'month' then 'month' else 'week' end,
+    'starts', coalesce(json_agg(b.bucket_start order by b.bucket_start), '[]'),
+    'count', coalesce(json_agg(b.n order by b.bucket_start), '[]'),
+    'mean', coalesce(json_agg(b.mean order by b.bucket_start), '[]'),
+    'min', coalesce(json_agg(b.min_score order by b.bucket_start), '[]'),
+    'max', coalesce(json_agg(b.max_score order by b.bucket_start), '[]'),
+    'units', coalesce(json_agg(coalesce(u.n_units, 0) order by b.bucket_start), '[]'),
+    'max_unit', coalesce(json_agg(u.max_unit order by b.bucket_start), '[]')
+  )
+  from buckets b
+  left join units u on u.bucket_start = b.bucket_start;
+$$;
@@ -0,0 +1,80 @@
+-- 반 배정 후보 추천: 미배정 학생을 DB에서 점수화해 상위 N명만 돌려줌 (api/students.py mode=available)
+-- 점수 (높을수록 위)
+--   학년   : 목표 학년과 같으면 3, 한 학년 차이 1.5, 두 학년 차이 0.5
+--   학교   : 이 반 학생 중 같은 학교 비율 (0~1)
+--   성취도 : 최근 평균(student_stats.recent_avg)이 반 평균과 가까울수록 최대 1 (50점 차이 이상이면 0)
+-- 미배정 학생은 다른 반 시간표가 없으므로 시간표 충돌은 점수에 넣지 않습니다.
+-- 미배정 학생 전체를 점수화한 뒤 상위 N명만 정렬(top-N)해서 보냅니다.
+-- 상위 N명 밖의 학생은 p_query(이름 부분 검색, students_name_trgm_idx)로 찾습니다.
+-- 학년은 '초1'~'고3' 문자열을 저장 시점에 숫자(grade_level, 초1=1 ... 고3=12)로 바꿔 두어
+-- 요청마다 문자열을 해석하지 않습니다.
+
+-- api/_lib/roster.py normalize_grade()가 만드는 '중2' 형식 → 8 (알 수 없는 형식은 NULL)
+create or replace function grade_level(p_grade text)
+returns integer
+language sql
+immutable
+as $$
+  select case left(p_grade, 1) when '초' then 0 when '중' then 6 when '고' then 9 end
+       + nullif(substring(p_grade from '\d+'), '')::integer;
+$$;
+
+alter table students
+  add column if not exists grade_level integer
+  generated always as (grade_level(grade)) stored;
+
+-- 이름 검색(p_query) 추가 전 시그니처가 남아 있으면 오버로드가 되어 호출이 모호해짐
+drop function if exists rank_available_students(bigint, text, integer);
+
+create or replace function rank_available_students(
+  p_class_id bigint default null,
+  p_target_grade text default null,
+  p_limit integer default 100,
+  p_query text default null
+)
+returns setof jsonb
+language sql
+stable
+as $$
+  with target as (
+    select grade_level(coalesce(nullif(p_target_grade, ''), c.target_grade)) as level
+    from (select 1) one
+    left join classes c on c.id = p_class_id
+  ),
+  members as (
+    select s.school_name, st.recent_avg
+    from students s
+    left join student_stats st on st.student_id = s.id
+    where s.class_id = p_class_id
+  ),
+  schools as (
+    select school_name, count(*)::numeric / (select count(*) from members) as share
+    from members
+    where school_name is not null
+    group by school_name
+  ),
+  class_avg as (
+    select avg(recent_avg) as value from members
+  ),
+  ranked as (
+    select
+      s.*,
+      (case abs(s.grade_level - t.level)
+         when 0 then 3 when 1 then 1.5 when 2 then 0.5 else 0
+       end)
+      + coalesce(sc.share, 0)
+      + coalesce(greatest(0, 1 - abs(st.recent_avg - ca.value) / 50), 0) as match_score
+    from students s
+    cross join target t
+    cross join class_avg ca
+    left join schools sc on sc.school_name = s.school_name
+    left join student_stats st on st.student_id = s.id
+    where s.class_id is null
+      and (coalesce(trim(p_query), '') = ''
+           or s.name ilike '%' || replace(replace(replace(trim(p_query), '\', '\\'), '%', '\%'), '_', '\_') || '%')
+  )
+  select to_jsonb(r) - 'match_score' || jsonb_build_object('match_score', round(r.match_score::numeric, 3))
+  from ranked r
+  order by r.match_score desc, r.grade, r.name, r.id
+  limit least(greatest(p_limit, 1), 500);
+$$;
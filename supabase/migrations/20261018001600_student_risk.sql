@@ -0,0 +1,120 @@
+-- 집중 케어 학생 (api/cron.py?job=risk → api/_lib/jobs.py → 판정 규칙 api/_lib/risk.py)
+-- 대시보드가 요청마다 student_stats 전체를 훑던 것을, 배치가 저장한 판정 결과를 읽는 것으로 바꿉니다.
+--
+-- 모든 학생이 한 행씩 가지며(flagged = false 포함) 배치는 "바뀐" 학생만 다시 판정합니다.
+--   * 아직 행이 없음
+--   * 기록이 바뀜 (student_stats.updated_at이 판정에 쓴 값과 다름)
+--   * 반이 바뀜
+--   * 반 시간표(classes.schedule_days)가 바뀜 - 결석 수/다음 판정일이 시간표로 계산되므로
+--   * 결석 판정이 바뀔 날짜(next_check_date)가 됨 - 기록이 없어도 날짜가 지나면 결석 수가 늘어나므로
+
+create table if not exists student_risk (
+  student_id bigint primary key references students (id) on delete cascade,
+  class_id bigint,
+  flagged boolean not null default false,
+  reasons jsonb not null default '[]',   -- [{code, message}] (api/_lib/risk.py)
+  recent_avg numeric,
+  trend numeric,                          -- 최근 구간 평균 - 이전 구간 평균
+  missed integer not null default 0,
+  next_check_date date,
+  stats_updated_at timestamptz,           -- 판정에 쓴 student_stats.updated_at (기록 없으면 NULL)
+  schedule_days smallint[],               -- 판정에 쓴 반 시간표 (반이 없으면 NULL)
+  evaluated_at timestamptz not null default now()
+);
+
+create index if not exists student_risk_flagged_idx on student_risk (student_id) where flagged;
+create index if not exists student_risk_next_check_idx on student_risk (next_check_date)
+  where next_check_date is not null;
+
+-- 배치 입력: 다시 판정할 학생의 최근 점수/마지막 기록/반 시간표
+create or replace function risk_inputs(p_today date, p_limit integer default 1000)
+returns table (
+  student_id bigint, class_id bigint, schedule_days smallint[],
+  recent_scores numeric[], last_log_at timestamptz, stats_updated_at timestamptz
+)
+language sql
+stable
+as $$
+  select s.id, s.class_id, c.schedule_days, st.recent_scores, st.last_log_at, st.updated_at
+  from students s
+  left join classes c on c.id = s.class_id
+  left join student_stats st on st.student_id = s.id
+  left join student_risk r on r.student_id = s.id
+  where r.student_id is null
+     or r.stats_updated_at is distinct from st.updated_at
+     or r.class_id is distinct from s.class_id
+     or r.schedule_days is distinct from c.schedule_days
+     or r.next_check_date <= p_today
+  order by s.id
+  limit greatest(1, least(p_limit, 5000));
+$$;
+
+-- 배치 결과 저장 (저장한 행 수 반환)
+-- 판정 도중 기록, 반, 반 시간표가 바뀐 학생은 건너뜀 → 다음 실행에서 다시 판정
+create or replace function store_student_risk(p_rows jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  v_count integer;
+begin
+  insert into student_risk as sr (
+    student_id, class_id, flagged, reasons, recent_avg, trend, missed, next_check_date, stats_updated_at,
+    schedule_days, evaluated_at
+  )
+  select r.student_id, r.class_id, r.flagged, coalesce(r.reasons, '[]'), r.recent_avg, r.trend,
+         coalesce(r.missed, 0), r.next_check_date, r.stats_updated_at, r.schedule_days, now()
+  from jsonb_to_recordset(p_rows) as r(
+    student_id bigint, class_id bigint, flagged boolean, reasons jsonb, recent_avg numeric, trend numeric,
+    missed integer, next_check_date date, stats_updated_at timestamptz, schedule_days smallint[]
+  )
+  join students s on s.id = r.student_id
+  left join classes c on c.id = s.class_id
+  left join student_stats st on st.student_id = r.student_id
+  where r.stats_updated_at is not distinct from st.updated_at
+    and r.class_id is not distinct from s.class_id
+    and r.schedule_days is not distinct from c.schedule_days
+  on conflict (student_id) do update set
+    class_id = excluded.class_id,
+    flagged = excluded.flagged,
+    reasons = excluded.reasons,
+    recent_avg = excluded.recent_avg,
+    trend = excluded.trend,
+    missed = excluded.missed,
+    next_check_date = excluded.next_check_date,
+    stats_updated_at = excluded.stats_updated_at,
+    schedule_days = excluded.schedule_days,
+    evaluated_at = excluded.evaluated_at;
+
+  get diagnostics v_count = row_count;
+  return v_count;
+end;
+$$;
+
+-- 대시보드: 집중 케어 학생은 저장된 판정 결과만 읽음 (응답 형태는 그대로 + reasons)
+create or replace function dashboard_summary(p_today date, p_dow smallint)
+returns json
+language sql
+stable
+as $$
+  with risk as (
+    select s.name, s.grade, r.recent_avg as avg, r.reasons, st.last_log_at
+    from student_risk r
+    join students s on s.id = r.student_id
+    left join student_stats st on st.student_id = r.student_id
+    where r.flagged
+  )
+  select json_build_object(
+    'today_classes', (select count(*) from classes where schedule_days @> array[p_dow]),
+    'total_students', (select count(*) from students),
+    'today_evals', (select count(*) from daily_logs where created_at >= p_today::timestamp),
+    'risk_students', coalesce(
+      -- 최근에 기록된 학생부터 (기록이 끊긴 학생은 뒤로)
+      (select json_agg(
+         json_build_object('name', name, 'grade', grade, 'avg', avg, 'reasons', reasons)
+         order by last_log_at desc nulls last
+       ) from risk),
+      '[]'::json
+    )
+  );
+$$;